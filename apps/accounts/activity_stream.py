@@ -0,0 +1,44 @@
+# apps/accounts/activity_stream.py
+"""
+Redis stream used to buffer UserActivity rows.
+
+Request handlers publish events with UserActivity.log_async(); the
+consume_activity_stream management command reads them back and inserts
+them in batches.
+"""
+import json
+
+import redis
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_datetime
+
+_client = None
+
+
+def get_client():
+    """Return a process-wide Redis client for the activity stream"""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.ACTIVITY_STREAM_REDIS_URL,
+            decode_responses=True
+        )
+    return _client
+
+
+def publish(event):
+    """Append an activity event to the stream"""
+    return get_client().xadd(
+        settings.ACTIVITY_STREAM_NAME,
+        {'event': json.dumps(event, cls=DjangoJSONEncoder)},
+        maxlen=settings.ACTIVITY_STREAM_MAXLEN,
+        approximate=True
+    )
+
+
+def decode(fields):
+    """Turn a stream entry back into UserActivity keyword arguments"""
+    event = json.loads(fields['event'])
+    event['timestamp'] = parse_datetime(event['timestamp'])
+    return event
@@ -1,7 +1,7 @@
 # apps/accounts/admin.py
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from django.utils.html import format_html
+from django.db.models import Count
 from django.urls import reverse
 from django.utils.safestring import mark_safe
 from .models import (
@@ -39,7 +39,7 @@ class UserAdmin(BaseUserAdmin):
             )
         }),
         ('Linked Entities', {
-            'fields': ('instructor_id', 'member_id'),
+            'fields': ('instructor', 'member'),
             'classes': ('collapse',)
         }),
         ('Important Dates', {
@@ -60,6 +60,8 @@ class UserAdmin(BaseUserAdmin):
     
     readonly_fields = ['created_at', 'updated_at', 'last_login', 'date_joined']
     
+    autocomplete_fields = ['instructor', 'member']
+    
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         return qs.select_related('profile')
@@ -210,13 +212,19 @@ class RoleAdmin(admin.ModelAdmin):
     readonly_fields = ['created_at', 'updated_at']
     
     def permissions_count(self, obj):
-        return obj.permissions.count()
+        return obj.permission_count
     permissions_count.short_description = 'Permissions'
+    permissions_count.admin_order_field = 'permission_count'
     
     def has_delete_permission(self, request, obj=None):
         if obj and obj.is_system_role:
             return False
         return super().has_delete_permission(request, obj)
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        qs = qs.annotate(permission_count=Count('permissions'))
+        return qs
 
 
 @admin.register(UserRole)
@@ -224,7 +232,7 @@ class UserRoleAdmin(admin.ModelAdmin):
     """Admin interface for UserRole"""
     list_display = [
         'user', 'role', 'assigned_by', 
-        'assigned_at', 'expires_at', 'is_active_status'
+        'assigned_at', 'expires_at', 'is_currently_active'
     ]
     list_filter = ['role', 'assigned_at', 'expires_at']
     search_fields = ['user__email', 'role__name']
@@ -241,15 +249,16 @@ class UserRoleAdmin(admin.ModelAdmin):
     
     readonly_fields = ['assigned_at']
     
-    def is_active_status(self, obj):
-        if obj.is_active:
-            return format_html(
-                '<span style="color: green;">✓ Active</span>'
-            )
-        return format_html(
-            '<span style="color: red;">✗ Inactive/Expired</span>'
-        )
-    is_active_status.short_description = 'Status'
+    def is_currently_active(self, obj):
+        return obj.is_currently_active
+    is_currently_active.short_description = 'Active'
+    is_currently_active.boolean = True
+    is_currently_active.admin_order_field = 'is_currently_active'
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        qs = qs.select_related('user', 'role', 'assigned_by').with_is_currently_active()
+        return qs
 
 
 @admin.register(APIKey)
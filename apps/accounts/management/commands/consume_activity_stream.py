@@ -0,0 +1,93 @@
+# apps/accounts/management/commands/consume_activity_stream.py
+import socket
+
+import redis
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import DataError, IntegrityError, transaction
+
+from apps.accounts.activity_stream import decode, get_client
+from apps.accounts.models import UserActivity
+
+
+class Command(BaseCommand):
+    help = 'Insert UserActivity events queued by UserActivity.log_async in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--block', type=int, default=5000,
+                            help='Milliseconds to wait for new events')
+        parser.add_argument('--group', default='activity-writers')
+        parser.add_argument('--consumer', default=socket.gethostname())
+
+    def handle(self, *args, **options):
+        client = get_client()
+        stream = settings.ACTIVITY_STREAM_NAME
+        group = options['group']
+        consumer = options['consumer']
+        batch_size = options['batch_size']
+
+        try:
+            client.xgroup_create(stream, group, id='0', mkstream=True)
+        except redis.ResponseError as exc:
+            if 'BUSYGROUP' not in str(exc):
+                raise
+
+        # Entries delivered to this consumer but never acked (e.g. after a
+        # crash) are replayed first, then we switch to new messages.
+        last_id = '0'
+        try:
+            while True:
+                response = client.xreadgroup(
+                    group, consumer, {stream: last_id},
+                    count=batch_size,
+                    block=None if last_id == '0' else options['block']
+                )
+                entries = response[0][1] if response else []
+                if not entries:
+                    last_id = '>'
+                    continue
+                self.write_batch(client, stream, group, entries, batch_size)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
+
+    def write_batch(self, client, stream, group, entries, batch_size):
+        """Insert one batch and acknowledge it; undecodable or rejected events are dead-lettered"""
+        rows, failed = [], []
+        for entry_id, fields in entries:
+            try:
+                rows.append((entry_id, fields, UserActivity(**decode(fields))))
+            except (ValueError, KeyError, TypeError) as exc:
+                failed.append((entry_id, fields, exc))
+
+        try:
+            with transaction.atomic():
+                UserActivity.objects.bulk_create(
+                    [activity for _, _, activity in rows],
+                    batch_size=batch_size
+                )
+        except (IntegrityError, DataError, ValueError):
+            # One bad row (e.g. a user deleted since the event was queued)
+            # fails the whole INSERT; find it row by row. FK checks are
+            # deferred to commit, so each row needs its own transaction.
+            for entry_id, fields, activity in rows:
+                activity.pk = None  # may be set by the rolled-back INSERT
+                try:
+                    with transaction.atomic():
+                        activity.save(force_insert=True)
+                except (IntegrityError, DataError, ValueError) as exc:
+                    failed.append((entry_id, fields, exc))
+
+        for entry_id, fields, exc in failed:
+            client.xadd(
+                settings.ACTIVITY_STREAM_DEAD_LETTER_NAME,
+                {**fields, 'source_id': entry_id, 'error': str(exc)[:500]},
+                maxlen=settings.ACTIVITY_STREAM_MAXLEN,
+                approximate=True
+            )
+            self.stderr.write(f'Dead-lettered activity event {entry_id}: {exc}')
+
+        ids = [entry_id for entry_id, _ in entries]
+        client.xack(stream, group, *ids)
+        client.xdel(stream, *ids)
+        self.stdout.write(f'Wrote {len(ids) - len(failed)} activity events')
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loginattempt',
+            index=models.Index(fields=['email', 'status', 'timestamp'], name='accounts_lo_email_895837_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='useractivity',
+            index=models.Index(fields=['user', 'action', 'timestamp'], name='accounts_us_user_id_45409a_idx'),
+        ),
+    ]
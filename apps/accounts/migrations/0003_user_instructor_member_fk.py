@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """
+    Turn the plain integer instructor_id/member_id columns into foreign keys
+    without moving data: rename the fields so the FK attnames match, then
+    alter them in place (the column names stay instructor_id/member_id).
+    """
+
+    dependencies = [
+        ('accounts', '0002_activity_and_login_attempt_indexes'),
+        ('instructors', '0001_initial'),
+        ('members', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='user',
+            old_name='instructor_id',
+            new_name='instructor',
+        ),
+        migrations.RenameField(
+            model_name='user',
+            old_name='member_id',
+            new_name='member',
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='instructor',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text='Linked instructor', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='instructors.instructor'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='member',
+            field=models.ForeignKey(blank=True, db_constraint=False, help_text='Linked member', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='users', to='members.member'),
+        ),
+    ]
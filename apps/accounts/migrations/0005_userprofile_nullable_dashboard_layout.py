@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:27
+
+from django.db import migrations, models
+
+
+def empty_layouts_to_null(apps, schema_editor):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    UserProfile.objects.filter(dashboard_layout={}).update(dashboard_layout=None)
+
+
+def null_layouts_to_empty(apps, schema_editor):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    UserProfile.objects.filter(dashboard_layout__isnull=True).update(dashboard_layout={})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='userprofile',
+            name='dashboard_layout',
+            field=models.JSONField(blank=True, help_text="User's dashboard layout configuration (null means default layout)", null=True),
+        ),
+        migrations.RunPython(empty_layouts_to_null, null_layouts_to_empty),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:50
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def populate_key_hash(apps, schema_editor):
+    APIKey = apps.get_model('accounts', 'APIKey')
+    api_keys = list(APIKey.objects.only('id', 'key'))
+    for api_key in api_keys:
+        api_key.key_hash = hashlib.sha256(api_key.key.encode()).digest()
+    APIKey.objects.bulk_update(api_keys, ['key_hash'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_userprofile_nullable_dashboard_layout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.BinaryField(max_length=32, null=True),
+        ),
+        migrations.RunPython(populate_key_hash, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key_hash',
+            field=models.BinaryField(help_text='SHA-256 digest of the key, used for lookups', max_length=32, unique=True),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:30
+
+import apps.accounts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_useractivity_timestamp_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='phone',
+            field=models.CharField(blank=True, max_length=17, null=True, validators=[apps.accounts.models.validate_phone]),
+        ),
+    ]
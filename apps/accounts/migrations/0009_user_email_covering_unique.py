@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_user_phone_validator'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('instructors', '0001_initial'),
+        ('members', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(max_length=254, verbose_name='email address'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(fields=('email',), include=('password', 'is_active', 'user_type', 'full_name'), name='user_email_uniq'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:32
+
+from django.db import migrations, models
+
+
+LOGIN_STATUSES = ['success', 'failed', 'blocked']
+ACTIVITY_ACTIONS = [
+    'login', 'logout', 'create', 'update', 'delete',
+    'view', 'export', 'import', 'other',
+]
+
+
+def to_codes(table, column, values):
+    """Convert the text column to smallint in place, mapping labels to codes"""
+    cases = ' '.join(f"WHEN '{value}' THEN {code}" for code, value in enumerate(values, 1))
+    return (
+        f'ALTER TABLE {table} ALTER COLUMN "{column}" TYPE smallint '
+        f'USING CASE "{column}" {cases} END'
+    )
+
+
+def to_labels(table, column, values):
+    """Map codes back to labels once AlterField has restored the text column"""
+    cases = ' '.join(f"WHEN '{code}' THEN '{value}'" for code, value in enumerate(values, 1))
+    return f'UPDATE {table} SET "{column}" = CASE "{column}" {cases} END'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_user_email_covering_unique'),
+    ]
+
+    operations = [
+        # Rewrite the values first; AlterField then only has to add the
+        # positive-integer check constraint.
+        migrations.RunSQL(
+            to_codes('accounts_loginattempt', 'status', LOGIN_STATUSES),
+            to_labels('accounts_loginattempt', 'status', LOGIN_STATUSES),
+        ),
+        migrations.RunSQL(
+            to_codes('accounts_useractivity', 'action', ACTIVITY_ACTIONS),
+            to_labels('accounts_useractivity', 'action', ACTIVITY_ACTIONS),
+        ),
+        migrations.AlterField(
+            model_name='loginattempt',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Success'), (2, 'Failed'), (3, 'Blocked')]),
+        ),
+        migrations.AlterField(
+            model_name='useractivity',
+            name='action',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Login'), (2, 'Logout'), (3, 'Create'), (4, 'Update'), (5, 'Delete'), (6, 'View'), (7, 'Export'), (8, 'Import'), (9, 'Other')]),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-15 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0010_small_int_activity_and_login_status'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='apikey',
+            name='accounts_ap_key_d955e0_idx',
+        ),
+        migrations.AlterField(
+            model_name='apikey',
+            name='key',
+            field=models.CharField(max_length=100),
+        ),
+    ]
@@ -1,9 +1,35 @@
 # apps/accounts/models.py
-from django.db import models
+import hashlib
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import (
+    Case, Count, DateTimeField, F, IntegerField, Min, Q, Value, When
+)
+from django.db.models.functions import Now, Upper
 from django.contrib.auth.models import AbstractUser, BaseUserManager
-from django.core.validators import RegexValidator
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .activity_stream import publish
+
+
+_PHONE_RE = re.compile(r'^\+?1?\d{9,15}$')
+
+
+def validate_phone(value):
+    """Validate an international phone number ('+999999999', up to 15 digits)"""
+    if value and not _PHONE_RE.match(value):
+        raise ValidationError(
+            "Phone number must be entered in format: '+999999999'. Up to 15 digits.",
+            code='invalid'
+        )
+
 
 class CustomUserManager(BaseUserManager):
     """Custom user manager for email-based authentication"""
@@ -30,6 +56,59 @@ class CustomUserManager(BaseUserManager):
             raise ValueError(_('Superuser must have is_superuser=True.'))
         
         return self.create_user(email, password, **extra_fields)
+    
+    def bulk_create_with_profiles(self, users_data):
+        """Create users and their profiles with one INSERT per table"""
+        users = []
+        for data in users_data:
+            data = dict(data)
+            password = data.pop('password', None)
+            user = self.model(email=self.normalize_email(data.pop('email')), **data)
+            user.set_password(password)
+            users.append(user)
+        
+        with transaction.atomic(using=self._db):
+            users = self.bulk_create(users)
+            UserProfile.objects.using(self._db).bulk_create(
+                [UserProfile(user=user) for user in users]
+            )
+        return users
+
+
+class UserRoleQuerySet(models.QuerySet):
+    """QuerySet helpers for role assignments"""
+    
+    ACTIVE = (Q(expires_at__isnull=True) | Q(expires_at__gte=Now())) & Q(role__is_active=True)
+    
+    def active(self):
+        """Assignments that have not expired and whose role is active"""
+        return self.filter(self.ACTIVE)
+    
+    def with_is_currently_active(self):
+        """Annotate is_currently_active, computed in SQL like active()"""
+        return self.annotate(
+            is_currently_active=Case(
+                When(self.ACTIVE, then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField()
+            )
+        )
+
+
+class APIKeyQuerySet(models.QuerySet):
+    """QuerySet helpers for API keys"""
+    
+    def valid(self):
+        """Active keys that have not expired"""
+        return self.filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gte=Now()),
+            is_active=True
+        )
+    
+    def for_key(self, raw_key):
+        """Valid key matching raw_key, looked up by its SHA-256 digest"""
+        key_hash = self.model.hash_key(raw_key)
+        return self.valid().filter(key_hash=key_hash).first()
 
 
 class User(AbstractUser):
@@ -45,15 +124,12 @@ class User(AbstractUser):
     
     # Remove username, use email instead
     username = None
-    email = models.EmailField(_('email address'), unique=True, db_index = True)
+    # Uniqueness is enforced by the covering user_email_uniq constraint
+    email = models.EmailField(_('email address'))
     
     # Additional fields
     user_type = models.CharField(max_length=20, choices=USER_TYPE_CHOICES, default='staff', db_index = True)
-    phone_regex = RegexValidator(
-        regex=r'^\+?1?\d{9,15}$',
-        message="Phone number must be entered in format: '+999999999'. Up to 15 digits."
-    )
-    phone = models.CharField(validators=[phone_regex], max_length=17, blank=True, null=True)
+    phone = models.CharField(validators=[validate_phone], max_length=17, blank=True, null=True)
     
     # Profile
     full_name = models.CharField(max_length=200, blank=True, null=True)
@@ -61,8 +137,24 @@ class User(AbstractUser):
     bio = models.TextField(blank=True, null=True)
     
     # Linked entities (optional - links to other models)
-    instructor_id = models.IntegerField(blank=True, null=True, help_text="Linked instructor ID")
-    member_id = models.IntegerField(blank=True, null=True, help_text="Linked member ID")
+    instructor = models.ForeignKey(
+        'instructors.Instructor',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        db_constraint=False,
+        related_name='users',
+        help_text="Linked instructor"
+    )
+    member = models.ForeignKey(
+        'members.Member',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        db_constraint=False,
+        related_name='users',
+        help_text="Linked member"
+    )
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -81,6 +173,26 @@ class User(AbstractUser):
         #     models.Index(fields=['user_type']),
         #     models.Index(fields=['is_active']),
         # ]
+        indexes = [
+            # Trigram indexes backing admin search (icontains -> UPPER(col) LIKE)
+            GinIndex(
+                OpClass(Upper('email'), name='gin_trgm_ops'),
+                name='accounts_user_email_trgm'
+            ),
+            GinIndex(
+                OpClass(Upper('full_name'), name='gin_trgm_ops'),
+                name='accounts_user_full_name_trgm'
+            ),
+        ]
+        constraints = [
+            # Covering index: authentication reads these columns straight
+            # from the index after the email lookup.
+            models.UniqueConstraint(
+                fields=['email'],
+                name='user_email_uniq',
+                include=['password', 'is_active', 'user_type', 'full_name']
+            ),
+        ]
         ordering = ['-created_at']
         verbose_name = _('user')
         verbose_name_plural = _('users')
@@ -113,25 +225,19 @@ class User(AbstractUser):
     
     @property
     def linked_instructor(self):
-        """Get linked instructor object"""
-        if self.instructor_id:
-            from apps.instructors.models import Instructor
-            try:
-                return Instructor.objects.get(id=self.instructor_id)
-            except Instructor.DoesNotExist:
-                return None
-        return None
+        """Get linked instructor object (use select_related('instructor'))"""
+        try:
+            return self.instructor
+        except ObjectDoesNotExist:
+            return None
     
     @property
     def linked_member(self):
-        """Get linked member object"""
-        if self.member_id:
-            from apps.members.models import Member
-            try:
-                return Member.objects.get(id=self.member_id)
-            except Member.DoesNotExist:
-                return None
-        return None
+        """Get linked member object (use select_related('member'))"""
+        try:
+            return self.member
+        except ObjectDoesNotExist:
+            return None
 
 
 class UserProfile(models.Model):
@@ -162,9 +268,9 @@ class UserProfile(models.Model):
     
     # Dashboard preferences
     dashboard_layout = models.JSONField(
-        default=dict,
         blank=True,
-        help_text="User's dashboard layout configuration"
+        null=True,
+        help_text="User's dashboard layout configuration (null means default layout)"
     )
     
     # Additional info
@@ -187,17 +293,18 @@ class UserProfile(models.Model):
 class UserActivity(models.Model):
     """Track user activity for audit purposes"""
     
-    ACTION_CHOICES = [
-        ('login', 'Login'),
-        ('logout', 'Logout'),
-        ('create', 'Create'),
-        ('update', 'Update'),
-        ('delete', 'Delete'),
-        ('view', 'View'),
-        ('export', 'Export'),
-        ('import', 'Import'),
-        ('other', 'Other'),
-    ]
+    class Action(models.IntegerChoices):
+        LOGIN = 1, 'Login'
+        LOGOUT = 2, 'Logout'
+        CREATE = 3, 'Create'
+        UPDATE = 4, 'Update'
+        DELETE = 5, 'Delete'
+        VIEW = 6, 'View'
+        EXPORT = 7, 'Export'
+        IMPORT = 8, 'Import'
+        OTHER = 9, 'Other'
+    
+    ACTION_CHOICES = Action.choices
     
     user = models.ForeignKey(
         User,
@@ -206,7 +313,7 @@ class UserActivity(models.Model):
     )
     
     # Activity details
-    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    action = models.PositiveSmallIntegerField(choices=Action.choices)
     description = models.TextField()
     
     # Target object (what was affected)
@@ -224,11 +331,14 @@ class UserActivity(models.Model):
         help_text="Additional activity metadata"
     )
     
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # default rather than auto_now_add so events written in bulk by
+    # consume_activity_stream keep the time they happened
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         indexes = [
             models.Index(fields=['user', 'timestamp']),
+            models.Index(fields=['user', 'action', 'timestamp']),
             models.Index(fields=['action', 'timestamp']),
             models.Index(fields=['target_model', 'target_id']),
         ]
@@ -237,20 +347,37 @@ class UserActivity(models.Model):
         verbose_name_plural = _('user activities')
     
     def __str__(self):
-        return f"{self.user.email} - {self.action} - {self.timestamp}"
+        return f"{self.user.email} - {self.get_action_display()} - {self.timestamp}"
+    
+    @classmethod
+    def log_async(cls, user_id, action, description, target_model=None,
+                  target_id=None, ip_address=None, user_agent=None, **metadata):
+        """Queue an activity event; consume_activity_stream inserts it in bulk"""
+        publish({
+            'user_id': user_id,
+            'action': action,
+            'description': description,
+            'target_model': target_model,
+            'target_id': target_id,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'metadata': metadata,
+            'timestamp': timezone.now(),
+        })
 
 
 class LoginAttempt(models.Model):
     """Track login attempts for security"""
     
-    STATUS_CHOICES = [
-        ('success', 'Success'),
-        ('failed', 'Failed'),
-        ('blocked', 'Blocked'),
-    ]
+    class Status(models.IntegerChoices):
+        SUCCESS = 1, 'Success'
+        FAILED = 2, 'Failed'
+        BLOCKED = 3, 'Blocked'
+    
+    STATUS_CHOICES = Status.choices
     
     email = models.EmailField()
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    status = models.PositiveSmallIntegerField(choices=Status.choices)
     ip_address = models.GenericIPAddressField()
     user_agent = models.CharField(max_length=500, blank=True, null=True)
     failure_reason = models.CharField(max_length=200, blank=True, null=True)
@@ -259,6 +386,7 @@ class LoginAttempt(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=['email', 'timestamp']),
+            models.Index(fields=['email', 'status', 'timestamp']),
             models.Index(fields=['ip_address', 'timestamp']),
             models.Index(fields=['status', 'timestamp']),
         ]
@@ -267,22 +395,75 @@ class LoginAttempt(models.Model):
         verbose_name_plural = _('login attempts')
     
     def __str__(self):
-        return f"{self.email} - {self.status} - {self.timestamp}"
+        return f"{self.email} - {self.get_status_display()} - {self.timestamp}"
+    
+    # Window is_blocked() counts failures over unless told otherwise
+    FAILURE_WINDOW_MINUTES = 30
+    
+    @staticmethod
+    def _failures_cache_key(email, minutes):
+        # The count depends on the window; max_attempts is applied after
+        return f'login_fail:{minutes}:{email}'
     
     @classmethod
-    def is_blocked(cls, email, minutes=30, max_attempts=5):
-        """Check if email is blocked due to too many failed attempts"""
-        from django.utils import timezone
-        from datetime import timedelta
+    def is_blocked(cls, email, minutes=FAILURE_WINDOW_MINUTES, max_attempts=5):
+        """Check if email is blocked due to too many failed attempts
         
-        cutoff_time = timezone.now() - timedelta(minutes=minutes)
-        recent_failures = cls.objects.filter(
-            email=email,
-            status='failed',
-            timestamp__gte=cutoff_time
-        ).count()
+        The failure count is cached per window until the oldest failure it
+        includes ages out, so a cached count never covers an attempt older
+        than `minutes`. Callers using another window must pass the same
+        `minutes` to record_failure()/record_success().
+        """
+        cache_key = cls._failures_cache_key(email, minutes)
+        recent_failures = cache.get(cache_key)
+        
+        if recent_failures is None:
+            now = timezone.now()
+            window = timedelta(minutes=minutes)
+            failures = cls.objects.filter(
+                email=email,
+                status=cls.Status.FAILED,
+                timestamp__gte=now - window
+            ).aggregate(count=Count('id'), oldest=Min('timestamp'))
+            recent_failures = failures['count']
+            # Later failures are newer and only incr() the count, so it stays
+            # exact until the oldest one leaves the window
+            expires_in = window if failures['oldest'] is None else failures['oldest'] + window - now
+            timeout = int(expires_in.total_seconds())
+            if timeout > 0:
+                cache.set(cache_key, recent_failures, timeout)
         
         return recent_failures >= max_attempts
+    
+    @classmethod
+    def record_failure(cls, email, ip_address, user_agent=None, failure_reason=None,
+                       minutes=FAILURE_WINDOW_MINUTES):
+        """Log a failed attempt and bump the cached failure count"""
+        attempt = cls.objects.create(
+            email=email,
+            status=cls.Status.FAILED,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            failure_reason=failure_reason
+        )
+        try:
+            cache.incr(cls._failures_cache_key(email, minutes))
+        except ValueError:
+            # Not cached yet - the next is_blocked() call counts from the DB
+            pass
+        return attempt
+    
+    @classmethod
+    def record_success(cls, email, ip_address, user_agent=None, minutes=FAILURE_WINDOW_MINUTES):
+        """Log a successful attempt and drop the cached failure count"""
+        attempt = cls.objects.create(
+            email=email,
+            status=cls.Status.SUCCESS,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        cache.delete(cls._failures_cache_key(email, minutes))
+        return attempt
 
 
 class Permission(models.Model):
@@ -344,6 +525,26 @@ class Role(models.Model):
     
     def __str__(self):
         return self.name
+    
+    @staticmethod
+    def _codenames_cache_key(role_id):
+        return f'role:codenames:{role_id}'
+    
+    @classmethod
+    def get_cached_codenames(cls, role_id):
+        """Permission codenames granted by a role, cached until they change"""
+        return cache.get_or_set(
+            cls._codenames_cache_key(role_id),
+            lambda: frozenset(
+                Permission.objects.filter(roles__id=role_id).values_list('codename', flat=True)
+            ),
+            3600
+        )
+    
+    @classmethod
+    def invalidate_cached_codenames(cls, role_ids):
+        """Drop cached codenames for the given roles"""
+        cache.delete_many([cls._codenames_cache_key(role_id) for role_id in role_ids])
 
 
 class UserRole(models.Model):
@@ -374,6 +575,8 @@ class UserRole(models.Model):
     
     notes = models.TextField(blank=True, null=True)
     
+    objects = UserRoleQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('user', 'role')
         indexes = [
@@ -389,14 +592,13 @@ class UserRole(models.Model):
     @property
     def is_expired(self):
         """Check if role assignment has expired"""
-        from django.utils import timezone
         if self.expires_at:
             return self.expires_at < timezone.now()
         return False
     
     @property
     def is_active(self):
-        """Check if role assignment is active"""
+        """Check if role assignment is active (see UserRole.objects.active())"""
         return not self.is_expired and self.role.is_active
 
 
@@ -411,7 +613,13 @@ class APIKey(models.Model):
     
     # Key details
     name = models.CharField(max_length=100, help_text="Descriptive name for this API key")
-    key = models.CharField(max_length=100, unique=True)
+    # Shown to admins on the change form; key_hash (unique) backs lookups
+    key = models.CharField(max_length=100)
+    key_hash = models.BinaryField(
+        max_length=32,
+        unique=True,
+        help_text="SHA-256 digest of the key, used for lookups"
+    )
     prefix = models.CharField(max_length=10)
     
     # Permissions
@@ -433,9 +641,10 @@ class APIKey(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = APIKeyQuerySet.as_manager()
+    
     class Meta:
         indexes = [
-            models.Index(fields=['key']),
             models.Index(fields=['prefix']),
             models.Index(fields=['user', 'is_active']),
         ]
@@ -446,10 +655,19 @@ class APIKey(models.Model):
     def __str__(self):
         return f"{self.name} ({self.prefix}***)"
     
+    def save(self, *args, **kwargs):
+        if self.key:
+            self.key_hash = self.hash_key(self.key)
+        super().save(*args, **kwargs)
+    
+    @staticmethod
+    def hash_key(raw_key):
+        """SHA-256 digest stored in key_hash"""
+        return hashlib.sha256(raw_key.encode()).digest()
+    
     @property
     def is_expired(self):
-        """Check if API key has expired"""
-        from django.utils import timezone
+        """Check if API key has expired (see APIKey.objects.valid())"""
         if self.expires_at:
             return self.expires_at < timezone.now()
         return False
@@ -459,9 +677,60 @@ class APIKey(models.Model):
         """Check if API key is valid and active"""
         return self.is_active and not self.is_expired
     
+    @staticmethod
+    def _usage_cache_keys(pk):
+        return f'apikey:req:{pk}', f'apikey:lu:{pk}'
+    
     def increment_usage(self):
-        """Increment usage counter"""
-        from django.utils import timezone
-        self.request_count += 1
-        self.last_used_at = timezone.now()
-        self.save(update_fields=['request_count', 'last_used_at'])
\ No newline at end of file
+        """Record one API call without reading the row first"""
+        if not getattr(settings, 'API_KEY_USAGE_BUFFERED', False):
+            APIKey.objects.filter(pk=self.pk).update(
+                request_count=F('request_count') + 1,
+                last_used_at=timezone.now()
+            )
+            return
+        
+        # Buffered mode needs a shared cache (Redis); flush_usage() writes
+        # the counters back periodically.
+        count_key, last_used_key = self._usage_cache_keys(self.pk)
+        if not cache.add(count_key, 1, timeout=None):
+            cache.incr(count_key)
+        cache.set(last_used_key, timezone.now(), timeout=None)
+    
+    @classmethod
+    def flush_usage(cls):
+        """Write buffered usage counters back in a single UPDATE"""
+        keys = {
+            pk: cls._usage_cache_keys(pk)
+            for pk in cls.objects.filter(is_active=True).values_list('id', flat=True)
+        }
+        cached = cache.get_many([key for pair in keys.values() for key in pair])
+        
+        deltas = {}
+        last_used = {}
+        for pk, (count_key, last_used_key) in keys.items():
+            if cached.get(count_key):
+                deltas[pk] = cached[count_key]
+                last_used[pk] = cached.get(last_used_key)
+        
+        if not deltas:
+            return 0
+        
+        with transaction.atomic():
+            cls.objects.filter(id__in=deltas).update(
+                request_count=F('request_count') + Case(
+                    *[When(id=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                    output_field=IntegerField()
+                ),
+                last_used_at=Case(
+                    *[When(id=pk, then=Value(ts)) for pk, ts in last_used.items() if ts],
+                    default=F('last_used_at'),
+                    output_field=DateTimeField()
+                )
+            )
+        
+        # Decrement rather than delete so hits recorded mid-flush are kept
+        for pk, delta in deltas.items():
+            cache.decr(keys[pk][0], delta)
+        
+        return len(deltas)
\ No newline at end of file
@@ -2,16 +2,44 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
 from .models import UserProfile
 
 User = get_user_model()
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
+    """Profile preferences nested in user responses"""
+    
     class Meta:
         model = UserProfile
-        fields = '__all__'
-        read_only_fields = ['user']
+        fields = [
+            'id', 'language', 'timezone',
+            'email_notifications', 'sms_notifications', 'push_notifications',
+            'updated_at'
+        ]
+        read_only_fields = ['id', 'updated_at']
+
+
+class UserProfileDetailSerializer(serializers.ModelSerializer):
+    """Full profile, including dashboard layout and personal details"""
+    
+    class Meta:
+        model = UserProfile
+        fields = [
+            'id', 'user', 'language', 'timezone',
+            'email_notifications', 'sms_notifications', 'push_notifications',
+            'dashboard_layout', 'date_of_birth', 'address',
+            'emergency_contact', 'emergency_phone',
+            'created_at', 'updated_at'
+        ]
+        read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if data['dashboard_layout'] is None:
+            data['dashboard_layout'] = {}
+        return data
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -28,6 +56,20 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {'password': {'write_only': True}}
 
 
+class UserListSerializer(serializers.ModelSerializer):
+    """Lightweight serializer for listing users"""
+    language = serializers.CharField(source='profile.language', read_only=True)
+    timezone = serializers.CharField(source='profile.timezone', read_only=True)
+    
+    class Meta:
+        model = User
+        fields = [
+            'id', 'email', 'full_name', 'user_type', 'phone',
+            'is_active', 'language', 'timezone',
+            'created_at', 'updated_at'
+        ]
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
         write_only=True, required=True, validators=[validate_password]
@@ -45,6 +87,7 @@ class RegisterSerializer(serializers.ModelSerializer):
             )
         return attrs
 
+    @transaction.atomic
     def create(self, validated_data):
         validated_data.pop('password2')
         user = User.objects.create_user(**validated_data)
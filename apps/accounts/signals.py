@@ -0,0 +1,32 @@
+# apps/accounts/signals.py
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .models import Permission, Role
+
+
+@receiver(m2m_changed, sender=Role.permissions.through)
+def invalidate_role_codenames_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Drop cached codenames when a role's permission set changes"""
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            Role.invalidate_cached_codenames([instance.pk])
+        return
+    
+    # Reverse side: instance is a Permission, pk_set holds role ids
+    if action == 'pre_clear':
+        Role.invalidate_cached_codenames(instance.roles.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        Role.invalidate_cached_codenames(pk_set)
+
+
+@receiver(post_save, sender=Permission)
+@receiver(pre_delete, sender=Permission)
+def invalidate_role_codenames_on_permission_change(sender, instance, **kwargs):
+    """A renamed or deleted permission affects every role that grants it"""
+    Role.invalidate_cached_codenames(instance.roles.values_list('id', flat=True))
+
+
+@receiver(post_delete, sender=Role)
+def invalidate_role_codenames_on_role_delete(sender, instance, **kwargs):
+    Role.invalidate_cached_codenames([instance.pk])
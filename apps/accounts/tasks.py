@@ -0,0 +1,10 @@
+# apps/accounts/tasks.py
+from celery import shared_task
+
+from apps.accounts.models import APIKey
+
+
+@shared_task
+def flush_api_key_usage_task():
+    """Persist API key usage counters buffered in the cache"""
+    return APIKey.flush_usage()
@@ -6,8 +6,8 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from apps.accounts.models import User
 from .models import User, UserProfile
 from .serializers import (
-    UserSerializer, RegisterSerializer, 
-    ChangePasswordSerializer, UserProfileSerializer
+    UserSerializer, UserListSerializer, RegisterSerializer, 
+    ChangePasswordSerializer, UserProfileDetailSerializer
 )
 
 # User = get_user_model()
@@ -49,21 +49,41 @@ class ChangePasswordView(generics.UpdateAPIView):
 
 class UserViewSet(viewsets.ModelViewSet):
     """User management viewset"""
-    queryset = User.objects.all()
+    queryset = User.objects.select_related('profile')
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        """Only load the columns the serializers render"""
+        qs = super().get_queryset()
+        if self.action == 'list':
+            qs = qs.only(
+                'id', 'email', 'full_name', 'user_type', 'phone',
+                'is_active', 'created_at', 'updated_at',
+                'profile__language', 'profile__timezone'
+            )
+        else:
+            qs = qs.defer('profile__dashboard_layout')
+        return qs
+
+    def get_serializer_class(self):
+        """Use lighter serializer for list action"""
+        if self.action == 'list':
+            return UserListSerializer
+        return UserSerializer
+
     @action(detail=False, methods=['get'])
     def me(self, request):
         """Get current user profile"""
-        serializer = self.get_serializer(request.user)
+        user = self.get_queryset().get(pk=request.user.pk)
+        serializer = self.get_serializer(user)
         return Response(serializer.data)
 
     @action(detail=False, methods=['put'])
     def update_profile(self, request):
         """Update user profile"""
         user = request.user
-        serializer = UserProfileSerializer(
+        serializer = UserProfileDetailSerializer(
             user.profile, 
             data=request.data, 
             partial=True
@@ -4,7 +4,12 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth import login, logout, authenticate
 from django.shortcuts import render, redirect
 from django.contrib import messages
+from django.core.cache import cache
 from django.urls import reverse_lazy
+from datetime import date
+from apps.courses.models import Enrollment
+from apps.financials.services import FinancialCalculationService
+from apps.students.models import Student
 from .forms import LoginForm
 
 
@@ -12,34 +17,28 @@ class DashboardView(LoginRequiredMixin, TemplateView):
     """Main dashboard view"""
     template_name = 'dashboard/index.html'
     login_url = 'login'
+    stats_cache_key = 'dashboard:stats'
+    stats_cache_timeout = 60  # seconds; counters may lag by up to a minute
+    
+    def get_stats(self):
+        """Dashboard counters, read with a single round-trip"""
+        return FinancialCalculationService.dashboard_totals(date.today())
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Import models
-        from apps.students.models import Student
-        from apps.courses.models import Course, Enrollment
-        from apps.payments.models import Payment
-        from apps.financials.models import MonthlyFinancial
-        from datetime import date
-        from decimal import Decimal
-        
         # Get statistics
-        context['total_students'] = Student.objects.filter(status='active').count()
-        context['total_courses'] = Course.objects.filter(status='active').count()
-        context['total_enrollments'] = Enrollment.objects.filter(status='active').count()
-        
-        # Payment statistics
-        pending_payments = Payment.objects.filter(status='pending')
-        context['pending_payments_count'] = pending_payments.count()
-        context['pending_payments_amount'] = sum(p.balance for p in pending_payments)
+        context.update(cache.get_or_set(
+            self.stats_cache_key, self.get_stats, self.stats_cache_timeout
+        ))
         
         # Recent students
-        context['recent_students'] = Student.objects.order_by('-created_at')[:5]
+        context['recent_students'] = Student.objects.only(
+            'full_name', 'education_level', 'status', 'created_at'
+        ).order_by('-created_at')[:5]
         
         # Recent enrollments
-        context['recent_enrollments'] = Enrollment.objects.select_related(
-            'student', 'course'
+        context['recent_enrollments'] = Enrollment.objects.with_dashboard_data(
         ).order_by('-created_at')[:5]
         # print(context)
         
@@ -2,9 +2,45 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.db.models import Count, Q
+from datetime import timedelta
+from django.utils import timezone
+from config.pagination import EstimatedCountPaginator
 from .models import Attendance, AttendanceSummary
 
 
+class RecentDateFilter(admin.SimpleListFilter):
+    """Last N days as an indexed date range"""
+    title = 'recent'
+    parameter_name = 'recent'
+    
+    def lookups(self, request, model_admin):
+        return [
+            ('30', 'Last 30 days'),
+            ('90', 'Last 90 days'),
+        ]
+    
+    def queryset(self, request, queryset):
+        if self.value() in ('30', '90'):
+            since = timezone.localdate() - timedelta(days=int(self.value()))
+            return queryset.filter(date__gte=since)
+        return queryset
+
+
+# Rendered once: status_badge runs for every changelist row
+STATUS_BADGES = {
+    status: format_html(
+        '<span style="color: {}; font-weight: bold;">{} {}</span>',
+        color, icon, dict(Attendance.STATUS_CHOICES)[status]
+    )
+    for status, (color, icon) in {
+        'present': ('green', '✓'),
+        'absent': ('red', '✗'),
+        'late': ('orange', '⚠'),
+        'excused': ('blue', 'ℹ'),
+    }.items()
+}
+
+
 @admin.register(Attendance)
 class AttendanceAdmin(admin.ModelAdmin):
     """Admin interface for Attendance model"""
@@ -13,13 +49,14 @@ class AttendanceAdmin(admin.ModelAdmin):
         'check_in_time', 'recorded_by'
     ]
     list_filter = [
-        'status', 'date', 'course__course_type'
+        'status', RecentDateFilter, 'date', 'course__course_type'
     ]
     search_fields = [
         'student__full_name', 'course__course_name', 
         'notes'
     ]
-    date_hierarchy = 'date'
+    # No date_hierarchy: its year/month drill-down runs a DISTINCT date
+    # query over the whole table on every changelist load
     ordering = ['-date', 'course', 'student__full_name']
     
     fieldsets = (
@@ -50,6 +87,8 @@ class AttendanceAdmin(admin.ModelAdmin):
     autocomplete_fields = ['student', 'course', 'enrollment']
     
     list_per_page = 50
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     actions = [
         'mark_as_present', 
@@ -58,29 +97,26 @@ class AttendanceAdmin(admin.ModelAdmin):
     ]
     
     def status_badge(self, obj):
-        colors = {
-            'present': 'green',
-            'absent': 'red',
-            'late': 'orange',
-            'excused': 'blue'
-        }
-        icons = {
-            'present': '✓',
-            'absent': '✗',
-            'late': '⚠',
-            'excused': 'ℹ'
-        }
-        color = colors.get(obj.status, 'gray')
-        icon = icons.get(obj.status, '?')
-        
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">{} {}</span>',
-            color, icon, obj.get_status_display()
+        return STATUS_BADGES.get(obj.status) or format_html(
+            '<span style="color: gray; font-weight: bold;">? {}</span>', obj.status
         )
     status_badge.short_description = 'Status'
     
+    update_chunk_size = 5000
+    
+    def _update_in_chunks(self, queryset, **fields):
+        """UPDATE the selection in primary-key chunks, keeping updated_at current"""
+        fields['updated_at'] = timezone.now()  # update() bypasses auto_now
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+        updated = 0
+        for start in range(0, len(pks), self.update_chunk_size):
+            updated += Attendance.objects.filter(
+                pk__in=pks[start:start + self.update_chunk_size]
+            ).update(**fields)
+        return updated
+    
     def mark_as_present(self, request, queryset):
-        updated = queryset.update(status='present')
+        updated = self._update_in_chunks(queryset, status='present')
         self.message_user(
             request, 
             f'{updated} record(s) marked as present.'
@@ -88,7 +124,7 @@ class AttendanceAdmin(admin.ModelAdmin):
     mark_as_present.short_description = 'Mark as Present'
     
     def mark_as_absent(self, request, queryset):
-        updated = queryset.update(status='absent')
+        updated = self._update_in_chunks(queryset, status='absent')
         self.message_user(
             request, 
             f'{updated} record(s) marked as absent.'
@@ -96,7 +132,7 @@ class AttendanceAdmin(admin.ModelAdmin):
     mark_as_absent.short_description = 'Mark as Absent'
     
     def mark_as_excused(self, request, queryset):
-        updated = queryset.update(status='excused')
+        updated = self._update_in_chunks(queryset, status='excused')
         self.message_user(
             request, 
             f'{updated} record(s) marked as excused.'
@@ -167,10 +203,7 @@ class AttendanceSummaryAdmin(admin.ModelAdmin):
     attendance_rate_display.short_description = 'Attendance Rate'
     
     def recalculate_summaries(self, request, queryset):
-        count = 0
-        for summary in queryset:
-            summary.calculate_summary()
-            count += 1
+        count = AttendanceSummary.recalculate(queryset)
         
         self.message_user(
             request, 
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:36
+
+from django.db import migrations, models
+
+
+CREATE_VIEW = """
+CREATE MATERIALIZED VIEW attendance_monthly_stats AS
+SELECT
+    row_number() OVER (ORDER BY month, student_id, course_id) AS id,
+    student_id,
+    course_id,
+    month,
+    total_sessions,
+    present_count,
+    absent_count,
+    late_count,
+    excused_count,
+    CASE WHEN total_sessions > 0
+        THEN round((present_count + late_count) * 100.0 / total_sessions, 2)
+        ELSE 0
+    END::numeric(5, 2) AS attendance_rate
+FROM (
+    SELECT
+        student_id,
+        course_id,
+        date_trunc('month', date)::date AS month,
+        count(*) AS total_sessions,
+        count(*) FILTER (WHERE status = 'present') AS present_count,
+        count(*) FILTER (WHERE status = 'absent') AS absent_count,
+        count(*) FILTER (WHERE status = 'late') AS late_count,
+        count(*) FILTER (WHERE status = 'excused') AS excused_count
+    FROM attendance_attendance
+    GROUP BY student_id, course_id, date_trunc('month', date)
+) AS totals;
+
+-- Required for REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX attendance_monthly_stats_key
+    ON attendance_monthly_stats (student_id, course_id, month);
+CREATE INDEX attendance_monthly_stats_month
+    ON attendance_monthly_stats (month);
+"""
+
+DROP_VIEW = "DROP MATERIALIZED VIEW IF EXISTS attendance_monthly_stats;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_VIEW, DROP_VIEW),
+        migrations.CreateModel(
+            name='AttendanceMonthlyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('total_sessions', models.PositiveIntegerField()),
+                ('present_count', models.PositiveIntegerField()),
+                ('absent_count', models.PositiveIntegerField()),
+                ('late_count', models.PositiveIntegerField()),
+                ('excused_count', models.PositiveIntegerField()),
+                ('attendance_rate', models.DecimalField(decimal_places=2, max_digits=5)),
+            ],
+            options={
+                'verbose_name_plural': 'Attendance monthly stats',
+                'db_table': 'attendance_monthly_stats',
+                'ordering': ['-month'],
+                'managed': False,
+            },
+        ),
+    ]
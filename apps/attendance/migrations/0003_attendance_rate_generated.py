@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:38
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_attendance_monthly_stats_view'),
+    ]
+
+    # Generated columns can't be altered in place: drop the stored value and
+    # re-add it as GENERATED ALWAYS AS (...) STORED, which PostgreSQL fills in.
+    operations = [
+        migrations.RemoveField(
+            model_name='attendancesummary',
+            name='attendance_rate',
+        ),
+        migrations.AddField(
+            model_name='attendancesummary',
+            name='attendance_rate',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(then=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(django.db.models.functions.comparison.Cast(django.db.models.expressions.CombinedExpression(models.F('present_count'), '+', models.F('late_count')), models.DecimalField(decimal_places=4, max_digits=12)), '*', models.Value(100)), '/', models.F('total_sessions')), total_sessions__gt=0), default=models.Value(0), output_field=models.DecimalField(decimal_places=4, max_digits=12)), help_text='Percentage of attendance (present + late) / total', output_field=models.DecimalField(decimal_places=2, max_digits=5)),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 09:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_attendance_rate_generated'),
+    ]
+
+    # id is a row_number() label that REFRESH renumbers, so the API only lists
+    # the view; (student_id, course_id, month) stays its stable unique key
+    operations = [
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX attendance_monthly_stats_id ON attendance_monthly_stats (id);',
+            'DROP INDEX IF EXISTS attendance_monthly_stats_id;'
+        ),
+    ]
@@ -1,8 +1,11 @@
 # apps/attendance/models.py
-from django.db import models
+from django.db import connection, models
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import Cast, TruncMonth
+from django.utils import timezone
 from apps.students.models import Student
 from apps.courses.models import Course, Enrollment
-from datetime import date
+from datetime import date, timedelta
 
 
 class Attendance(models.Model):
@@ -73,17 +76,39 @@ class Attendance(models.Model):
         return f"{self.student.full_name} - {self.course.course_name} - {self.date} ({self.status})"
     
     def save(self, *args, **kwargs):
-        # Auto-populate enrollment if not provided
-        if not self.enrollment:
-            try:
-                self.enrollment = Enrollment.objects.get(
-                    student=self.student,
-                    course=self.course,
-                    status='active'
-                )
-            except Enrollment.DoesNotExist:
-                pass
+        # Auto-populate enrollment if not provided. Check the raw id so an
+        # already-linked record doesn't load its enrollment, and fetch only the id.
+        if self.enrollment_id is None:
+            self.enrollment_id = Enrollment.objects.filter(
+                student_id=self.student_id,
+                course_id=self.course_id,
+                status='active'
+            ).values_list('id', flat=True).first()
         super().save(*args, **kwargs)
+    
+    @classmethod
+    def attach_enrollments(cls, records):
+        """Fill in the active enrollment for unsaved records in one query (as save() does per row)"""
+        missing = [record for record in records if record.enrollment_id is None]
+        if not missing:
+            return records
+        
+        enrollments = {
+            (enrollment.student_id, enrollment.course_id): enrollment
+            for enrollment in Enrollment.objects.filter(
+                status='active',
+                student_id__in={record.student_id for record in missing},
+                course_id__in={record.course_id for record in missing}
+            )
+        }
+        for record in missing:
+            record.enrollment = enrollments.get((record.student_id, record.course_id))
+        return records
+
+
+def _next_month(month):
+    """First day of the month after ``month``"""
+    return (month.replace(day=28) + timedelta(days=4)).replace(day=1)
 
 
 class AttendanceSummary(models.Model):
@@ -109,11 +134,21 @@ class AttendanceSummary(models.Model):
     late_count = models.PositiveIntegerField(default=0)
     excused_count = models.PositiveIntegerField(default=0)
     
-    # Calculated
-    attendance_rate = models.DecimalField(
-        max_digits=5,
-        decimal_places=2,
-        default=0,
+    # Calculated by the database (stored generated column)
+    attendance_rate = models.GeneratedField(
+        expression=Case(
+            When(
+                total_sessions__gt=0,
+                then=Cast(
+                    F('present_count') + F('late_count'),
+                    models.DecimalField(max_digits=12, decimal_places=4)
+                ) * 100 / F('total_sessions')
+            ),
+            default=Value(0),
+            output_field=models.DecimalField(max_digits=12, decimal_places=4)
+        ),
+        output_field=models.DecimalField(max_digits=5, decimal_places=2),
+        db_persist=True,
         help_text="Percentage of attendance (present + late) / total"
     )
     
@@ -133,38 +168,111 @@ class AttendanceSummary(models.Model):
     def __str__(self):
         return f"{self.student.full_name} - {self.course.course_name} - {self.month.strftime('%B %Y')}"
     
+    STATUS_COUNT_FIELDS = {
+        'present': 'present_count',
+        'absent': 'absent_count',
+        'late': 'late_count',
+        'excused': 'excused_count',
+    }
+    
+    @classmethod
+    def _count_annotations(cls):
+        annotations = {'total': Count('id')}
+        for status in cls.STATUS_COUNT_FIELDS:
+            annotations[status] = Count('id', filter=Q(status=status))
+        return annotations
+    
+    def apply_counts(self, counts):
+        """Set the count fields from aggregated counts (attendance_rate follows in the DB)"""
+        self.total_sessions = counts.get('total') or 0
+        for status, field in self.STATUS_COUNT_FIELDS.items():
+            setattr(self, field, counts.get(status) or 0)
+    
     def calculate_summary(self):
         """Calculate attendance summary from records"""
-        from django.db.models import Count, Q
-        
-        # Get attendance records for the month
+        # Get attendance records for the month (a plain date range, so the
+        # (student, date) index applies; __month compiles to EXTRACT)
+        start = self.month.replace(day=1)
         records = Attendance.objects.filter(
-            student=self.student,
-            course=self.course,
-            date__year=self.month.year,
-            date__month=self.month.month
+            student_id=self.student_id,
+            course_id=self.course_id,
+            date__gte=start,
+            date__lt=_next_month(start)
         )
         
         # Count by status
-        counts = records.aggregate(
-            total=Count('id'),
-            present=Count('id', filter=Q(status='present')),
-            absent=Count('id', filter=Q(status='absent')),
-            late=Count('id', filter=Q(status='late')),
-            excused=Count('id', filter=Q(status='excused'))
-        )
+        self.apply_counts(records.aggregate(**self._count_annotations()))
+        self.save()
+        self.refresh_from_db(fields=['attendance_rate'])  # computed by the DB on UPDATE
+    
+    @classmethod
+    def recalculate(cls, summaries):
+        """Recalculate many summaries with one grouped query and one bulk update"""
+        summaries = list(summaries)
+        if not summaries:
+            return 0
         
-        self.total_sessions = counts['total'] or 0
-        self.present_count = counts['present'] or 0
-        self.absent_count = counts['absent'] or 0
-        self.late_count = counts['late'] or 0
-        self.excused_count = counts['excused'] or 0
+        months = [summary.month.replace(day=1) for summary in summaries]
+        rows = Attendance.objects.filter(
+            student_id__in={summary.student_id for summary in summaries},
+            course_id__in={summary.course_id for summary in summaries},
+            date__gte=min(months),
+            date__lt=_next_month(max(months))
+        ).annotate(
+            period=TruncMonth('date')
+        ).values(
+            'student_id', 'course_id', 'period'
+        ).annotate(**cls._count_annotations()).order_by()
         
-        # Calculate attendance rate
-        if self.total_sessions > 0:
-            attended = self.present_count + self.late_count
-            self.attendance_rate = (attended / self.total_sessions) * 100
-        else:
-            self.attendance_rate = 0
+        counts = {
+            (row['student_id'], row['course_id'], row['period']): row
+            for row in rows
+        }
+        now = timezone.now()
+        for summary, month in zip(summaries, months):
+            summary.apply_counts(counts.get((summary.student_id, summary.course_id, month), {}))
+            summary.updated_at = now  # bulk_update skips auto_now
         
-        self.save()
\ No newline at end of file
+        cls.objects.bulk_update(
+            summaries,
+            ['total_sessions', *cls.STATUS_COUNT_FIELDS.values(), 'updated_at'],
+            batch_size=500
+        )
+        return len(summaries)
+
+
+class AttendanceMonthlyStats(models.Model):
+    """Read-only monthly attendance totals backed by a materialized view"""
+    student = models.ForeignKey(
+        Student,
+        on_delete=models.DO_NOTHING,
+        related_name='+'
+    )
+    course = models.ForeignKey(
+        Course,
+        on_delete=models.DO_NOTHING,
+        related_name='+'
+    )
+    month = models.DateField()
+    
+    total_sessions = models.PositiveIntegerField()
+    present_count = models.PositiveIntegerField()
+    absent_count = models.PositiveIntegerField()
+    late_count = models.PositiveIntegerField()
+    excused_count = models.PositiveIntegerField()
+    attendance_rate = models.DecimalField(max_digits=5, decimal_places=2)
+    
+    class Meta:
+        managed = False
+        db_table = 'attendance_monthly_stats'
+        ordering = ['-month']
+        verbose_name_plural = 'Attendance monthly stats'
+    
+    def __str__(self):
+        return f"{self.student_id} - {self.course_id} - {self.month.strftime('%B %Y')}"
+    
+    @classmethod
+    def refresh(cls):
+        """Rebuild the view without blocking readers"""
+        with connection.cursor() as cursor:
+            cursor.execute(f'REFRESH MATERIALIZED VIEW CONCURRENTLY {cls._meta.db_table}')
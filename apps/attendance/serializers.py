@@ -1,6 +1,6 @@
 # apps/attendance/serializers.py
 from rest_framework import serializers
-from .models import Attendance, AttendanceSummary
+from .models import Attendance, AttendanceSummary, AttendanceMonthlyStats
 
 
 class AttendanceSerializer(serializers.ModelSerializer):
@@ -19,9 +19,18 @@ class AttendanceSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class AttendanceBulkSerializer(AttendanceSerializer):
+    """Per-record validation for bulk_record, which checks uniqueness for the whole batch"""
+    
+    class Meta(AttendanceSerializer.Meta):
+        validators = []
+
+
 class AttendanceSummarySerializer(serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.full_name', read_only=True)
     course_name = serializers.CharField(source='course.course_name', read_only=True)
+    # GeneratedField maps to a plain ModelField; keep the decimal string output
+    attendance_rate = serializers.DecimalField(max_digits=5, decimal_places=2, read_only=True)
     
     class Meta:
         model = AttendanceSummary
@@ -32,3 +41,16 @@ class AttendanceSummarySerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class AttendanceMonthlyStatsSerializer(serializers.ModelSerializer):
+    student_name = serializers.CharField(source='student.full_name', read_only=True)
+    course_name = serializers.CharField(source='course.course_name', read_only=True)
+    
+    class Meta:
+        model = AttendanceMonthlyStats
+        fields = [
+            'student', 'student_name', 'course', 'course_name',
+            'month', 'total_sessions', 'present_count', 'absent_count',
+            'late_count', 'excused_count', 'attendance_rate'
+        ]
@@ -0,0 +1,10 @@
+# apps/attendance/tasks.py
+from celery import shared_task
+
+from apps.attendance.models import AttendanceMonthlyStats
+
+
+@shared_task
+def update_monthly_summaries_task():
+    """Refresh the attendance_monthly_stats materialized view"""
+    AttendanceMonthlyStats.refresh()
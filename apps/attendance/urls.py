@@ -6,6 +6,7 @@ from apps.attendance import views
 router = DefaultRouter()
 router.register(r'records', views.AttendanceViewSet, basename='attendance')
 router.register(r'summaries', views.AttendanceSummaryViewSet, basename='attendance-summary')
+router.register(r'monthly-stats', views.AttendanceMonthlyStatsViewSet, basename='attendance-monthly-stats')
 
 urlpatterns = [
     path('', include(router.urls)),
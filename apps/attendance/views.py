@@ -1,13 +1,18 @@
 # apps/attendance/views.py
-from rest_framework import viewsets, status
+from rest_framework import mixins, serializers, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django.db import transaction
+from django.db.models import F
 from datetime import date
 
-from .models import Attendance, AttendanceSummary
-from .serializers import AttendanceSerializer, AttendanceSummarySerializer
+from .models import Attendance, AttendanceSummary, AttendanceMonthlyStats
+from .serializers import (
+    AttendanceSerializer, AttendanceBulkSerializer, AttendanceSummarySerializer,
+    AttendanceMonthlyStatsSerializer
+)
 
 
 class AttendanceViewSet(viewsets.ModelViewSet):
@@ -31,19 +36,55 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        created_records = []
+        candidates = []
+        seen = set()
         errors = []
         
         for record_data in records:
-            serializer = AttendanceSerializer(data=record_data)
-            if serializer.is_valid():
-                serializer.save()
-                created_records.append(serializer.data)
-            else:
+            serializer = AttendanceBulkSerializer(data=record_data)
+            if not serializer.is_valid():
                 errors.append({
                     'data': record_data,
                     'errors': serializer.errors
                 })
+                continue
+            
+            record = Attendance(**serializer.validated_data)
+            key = (record.student_id, record.course_id, record.date)
+            if key in seen:
+                errors.append({
+                    'data': record_data,
+                    'errors': {'non_field_errors': ['Duplicate record in this request.']}
+                })
+                continue
+            seen.add(key)
+            candidates.append((record_data, record))
+        
+        # One query for the whole batch instead of a unique_together check per record
+        existing = set(Attendance.objects.filter(
+            student_id__in={key[0] for key in seen},
+            course_id__in={key[1] for key in seen},
+            date__in={key[2] for key in seen}
+        ).values_list('student_id', 'course_id', 'date')) if seen else set()
+        
+        new_records = []
+        for record_data, record in candidates:
+            if (record.student_id, record.course_id, record.date) in existing:
+                errors.append({
+                    'data': record_data,
+                    'errors': {'non_field_errors': [
+                        'The fields student, course, date must make a unique set.'
+                    ]}
+                })
+            else:
+                new_records.append(record)
+        
+        # Resolve enrollments in one query and insert in one statement rather
+        # than calling save() (and its enrollment lookup) per record
+        Attendance.attach_enrollments(new_records)
+        with transaction.atomic():
+            created = Attendance.objects.bulk_create(new_records, batch_size=1000)
+        created_records = AttendanceSerializer(created, many=True).data
         
         return Response({
             'created': len(created_records),
@@ -72,13 +113,27 @@ class AttendanceViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Project straight to dicts with the same keys as AttendanceSerializer;
+        # rosters can be large and need no model instances.
         records = Attendance.objects.filter(
             course_id=course_id,
             date=attendance_date
-        ).select_related('student', 'course')
+        ).values(
+            'id', 'student', 'course', 'enrollment', 'date', 'status',
+            'check_in_time', 'check_out_time', 'notes', 'recorded_by',
+            'created_at', 'updated_at',
+            student_name=F('student__full_name'),
+            course_name=F('course__course_name')
+        )
         
-        serializer = self.get_serializer(records, many=True)
-        return Response(serializer.data)
+        # Match the serializer's configured datetime format
+        datetime_field = serializers.DateTimeField()
+        records = list(records)
+        for record in records:
+            record['created_at'] = datetime_field.to_representation(record['created_at'])
+            record['updated_at'] = datetime_field.to_representation(record['updated_at'])
+        
+        return Response(records)
 
 
 class AttendanceSummaryViewSet(viewsets.ModelViewSet):
@@ -99,4 +154,16 @@ class AttendanceSummaryViewSet(viewsets.ModelViewSet):
         return Response({
             'message': 'Summary recalculated successfully',
             'data': serializer.data
-        })
\ No newline at end of file
+        })
+
+
+class AttendanceMonthlyStatsViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Monthly attendance totals from the nightly materialized view"""
+    # List only: the view's id is renumbered by every refresh, so a
+    # /monthly-stats/{id}/ route would not keep pointing at the same row;
+    # filter on student/course/month instead
+    queryset = AttendanceMonthlyStats.objects.select_related('student', 'course')
+    serializer_class = AttendanceMonthlyStatsSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['student', 'course', 'month']
+    ordering = ['-month']
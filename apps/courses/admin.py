@@ -1,7 +1,9 @@
 # apps/courses/admin.py
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Prefetch
 from .models import Course, CourseInstructor, Enrollment
 
 
@@ -73,6 +75,7 @@ class CourseAdmin(admin.ModelAdmin):
     inlines = [CourseInstructorInline]
     
     list_per_page = 25
+    show_full_result_count = False
     
     actions = [
         'activate_courses', 
@@ -81,7 +84,8 @@ class CourseAdmin(admin.ModelAdmin):
     ]
     
     def instructor_names(self, obj):
-        instructors = obj.course_instructors.select_related('instructor')
+        # .all() reads the list prefetched in get_queryset (primary first)
+        instructors = obj.course_instructors.all()
         names = []
         for ci in instructors:
             if ci.is_primary:
@@ -92,7 +96,7 @@ class CourseAdmin(admin.ModelAdmin):
     instructor_names.short_description = 'Instructors'
     
     def enrollment_status(self, obj):
-        enrolled = obj.enrollments.filter(status='active').count()
+        enrolled = obj.enrolled_count
         max_students = obj.max_students
         percentage = (enrolled / max_students * 100) if max_students > 0 else 0
         
@@ -103,9 +107,10 @@ class CourseAdmin(admin.ModelAdmin):
             color, enrolled, max_students, int(percentage)
         )
     enrollment_status.short_description = 'Enrollment'
+    enrollment_status.admin_order_field = 'active_enrollment_count'
     
     def activate_courses(self, request, queryset):
-        updated = queryset.update(status='active')
+        updated = queryset.update(status='active', updated_at=timezone.now())
         self.message_user(
             request, 
             f'{updated} course(s) activated successfully.'
@@ -113,7 +118,7 @@ class CourseAdmin(admin.ModelAdmin):
     activate_courses.short_description = 'Activate selected courses'
     
     def complete_courses(self, request, queryset):
-        updated = queryset.update(status='completed')
+        updated = queryset.update(status='completed', updated_at=timezone.now())
         self.message_user(
             request, 
             f'{updated} course(s) marked as completed.'
@@ -121,7 +126,7 @@ class CourseAdmin(admin.ModelAdmin):
     complete_courses.short_description = 'Mark selected as completed'
     
     def cancel_courses(self, request, queryset):
-        updated = queryset.update(status='cancelled')
+        updated = queryset.update(status='cancelled', updated_at=timezone.now())
         self.message_user(
             request, 
             f'{updated} course(s) cancelled.'
@@ -130,7 +135,12 @@ class CourseAdmin(admin.ModelAdmin):
     
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        qs = qs.prefetch_related('course_instructors__instructor')
+        qs = qs.defer('search_vector').prefetch_related(
+            Prefetch(
+                'course_instructors',
+                queryset=CourseInstructor.objects.select_related('instructor').order_by('-is_primary')
+            )
+        )
         return qs
 
 
@@ -197,6 +207,7 @@ class EnrollmentAdmin(admin.ModelAdmin):
     autocomplete_fields = ['student', 'course']
     
     list_per_page = 25
+    show_full_result_count = False
     
     actions = [
         'activate_enrollments', 
@@ -204,8 +215,18 @@ class EnrollmentAdmin(admin.ModelAdmin):
         'suspend_enrollments'
     ]
     
+    def _update_status(self, queryset, **fields):
+        """UPDATE the selection and resync the affected courses' seat counts"""
+        fields['updated_at'] = timezone.now()  # update() bypasses auto_now
+        with transaction.atomic():
+            course_ids = set(queryset.values_list('course_id', flat=True))
+            updated = queryset.update(**fields)
+            # update() doesn't send the signals that maintain the counter
+            Course.objects.filter(pk__in=course_ids).recount_enrollments()
+        return updated
+    
     def activate_enrollments(self, request, queryset):
-        updated = queryset.update(status='active')
+        updated = self._update_status(queryset, status='active')
         self.message_user(
             request, 
             f'{updated} enrollment(s) activated.'
@@ -214,7 +235,8 @@ class EnrollmentAdmin(admin.ModelAdmin):
     
     def complete_enrollments(self, request, queryset):
         from datetime import date
-        updated = queryset.update(
+        updated = self._update_status(
+            queryset,
             status='completed', 
             completion_date=date.today()
         )
@@ -225,7 +247,7 @@ class EnrollmentAdmin(admin.ModelAdmin):
     complete_enrollments.short_description = 'Mark selected as completed'
     
     def suspend_enrollments(self, request, queryset):
-        updated = queryset.update(status='suspended')
+        updated = self._update_status(queryset, status='suspended')
         self.message_user(
             request, 
             f'{updated} enrollment(s) suspended.'
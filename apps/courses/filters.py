@@ -0,0 +1,19 @@
+# apps/courses/filters.py
+import django_filters
+
+from apps.courses.models import Course
+
+
+class CourseFilter(django_filters.FilterSet):
+    """Course list filters; schedule_day is served by the schedule_days GIN index"""
+    schedule_day = django_filters.ChoiceFilter(
+        choices=Course.DAY_CHOICES,
+        method='filter_schedule_day'
+    )
+    
+    class Meta:
+        model = Course
+        fields = ['course_type', 'status', 'subject']
+    
+    def filter_schedule_day(self, queryset, name, value):
+        return queryset.filter(schedule_days__contains=[value])
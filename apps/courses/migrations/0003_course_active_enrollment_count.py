@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:41
+
+from django.db import migrations, models
+
+
+BACKFILL = """
+UPDATE courses_course AS c
+SET active_enrollment_count = e.total
+FROM (
+    SELECT course_id, count(*) AS total
+    FROM courses_enrollment
+    WHERE status = 'active'
+    GROUP BY course_id
+) AS e
+WHERE e.course_id = c.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_enrollment_active_course_partial_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='active_enrollment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of active enrollments'),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:43
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_course_active_enrollment_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['schedule_days'], name='course_schedule_days_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -1,11 +1,53 @@
 # apps/courses/models.py
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from apps.students.models import Student
 from apps.instructors.models import Instructor
 
 
+class CourseQuerySet(models.QuerySet):
+    """QuerySet helpers for courses"""
+    
+    def recount_enrollments(self):
+        """Recompute active_enrollment_count from the enrollments table"""
+        active = Enrollment.objects.filter(
+            course=models.OuterRef('pk'),
+            status='active'
+        ).order_by().values('course').annotate(
+            total=models.Count('pk')
+        ).values('total')
+        return self.update(
+            active_enrollment_count=Coalesce(models.Subquery(active), 0)
+        )
+    
+    def for_enrollment(self, student):
+        """Lock the rows and annotate student_enrolled (an active seat already held)"""
+        return self.select_for_update().annotate(
+            student_enrolled=models.Exists(
+                Enrollment.objects.filter(
+                    course=models.OuterRef('pk'),
+                    student=student,
+                    status='active'
+                )
+            )
+        )
+    
+    def with_revenue(self):
+        """Annotate revenue_potential, which total_revenue_potential prefers"""
+        return self.annotate(
+            revenue_potential=models.ExpressionWrapper(
+                models.F('active_enrollment_count')
+                * models.F('fee_per_month')
+                * models.F('duration_months'),
+                output_field=models.DecimalField(max_digits=14, decimal_places=2)
+            )
+        )
+
+
 class Course(models.Model):
     """Course model"""
     COURSE_TYPE_CHOICES = [
@@ -52,6 +94,13 @@ class Course(models.Model):
         validators=[MinValueValidator(1)],
         help_text="Maximum number of students"
     )
+    # Maintained by apps.courses.signals; QuerySet.update() and bulk_create()
+    # on Enrollment bypass it, so follow those with recount_enrollments()
+    active_enrollment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of active enrollments"
+    )
     
     # Duration
     duration_months = models.PositiveIntegerField(
@@ -89,6 +138,15 @@ class Course(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Maintained by the database; backs the API ?search= (FullTextSearchFilter)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('course_name', 'subject', 'description', config='simple'),
+        output_field=SearchVectorField(),
+        db_persist=True
+    )
+    
+    objects = CourseQuerySet.as_manager()
+    
     class Meta:
         # db_index = True
         # indexes = [
@@ -98,6 +156,15 @@ class Course(models.Model):
         #     models.Index(fields=['start_date']),
         #     models.Index(fields=['subject']),
         # ]
+        indexes = [
+            # jsonb_path_ops only serves @>, i.e. schedule_days__contains=[...]
+            GinIndex(
+                fields=['schedule_days'],
+                opclasses=['jsonb_path_ops'],
+                name='course_schedule_days_gin'
+            ),
+            GinIndex(fields=['search_vector'], name='course_search_vector_gin'),
+        ]
         ordering = ['-start_date', 'course_name']
     
     def __str__(self):
@@ -106,12 +173,12 @@ class Course(models.Model):
     @property
     def enrolled_count(self):
         """Number of currently enrolled students"""
-        return self.enrollments.filter(status='active').count()
+        return self.active_enrollment_count
     
     @property
     def is_full(self):
         """Check if course is at capacity"""
-        return self.enrolled_count >= self.max_students
+        return self.active_enrollment_count >= self.max_students
     
     @property
     def available_seats(self):
@@ -121,6 +188,9 @@ class Course(models.Model):
     @property
     def total_revenue_potential(self):
         """Total potential revenue from enrolled students"""
+        annotated = getattr(self, 'revenue_potential', None)
+        if annotated is not None:
+            return annotated
         return self.enrolled_count * self.fee_per_month * self.duration_months
 
 
@@ -170,6 +240,50 @@ class CourseInstructor(models.Model):
         return f"{self.instructor.full_name} - {self.course.course_name} ({primary})"
 
 
+class EnrollmentQuerySet(models.QuerySet):
+    """QuerySet helpers for enrollments"""
+    
+    def with_dashboard_data(self):
+        """Student and course joined in, limited to what the dashboard renders"""
+        return self.select_related('student', 'course').only(
+            'enrollment_date', 'status', 'created_at',
+            'student__full_name', 'course__course_name'
+        )
+    
+    def with_balance(self):
+        """Annotate paid_total and due_total, which total_paid/total_due/balance prefer"""
+        from apps.payments.models import Payment
+        
+        # Subquery rather than a join so it composes with other annotations
+        paid = Payment.objects.filter(
+            enrollment=models.OuterRef('pk'),
+            status='paid'
+        ).order_by().values('enrollment').annotate(
+            total=models.Sum('amount')
+        ).values('total')
+        
+        return self.annotate(
+            paid_total=Coalesce(
+                models.Subquery(paid), Decimal('0'),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            ),
+            due_total=models.ExpressionWrapper(
+                models.F('course__fee_per_month') * models.F('course__duration_months'),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+    
+    def with_attendance(self):
+        """Annotate att_total and att_present, which attendance_rate prefers"""
+        return self.annotate(
+            att_total=models.Count('attendance_records'),
+            att_present=models.Count(
+                'attendance_records',
+                filter=models.Q(attendance_records__status='present')
+            )
+        )
+
+
 class Enrollment(models.Model):
     """Student enrollment in courses"""
     STATUS_CHOICES = [
@@ -211,12 +325,20 @@ class Enrollment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EnrollmentQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('student', 'course')
         indexes = [
             models.Index(fields=['student', 'status']),
             models.Index(fields=['course', 'status']),
             models.Index(fields=['enrollment_date']),
+            # Active seats per course: enrolled_count, is_full, duplicate checks
+            models.Index(
+                fields=['course'],
+                condition=models.Q(status='active'),
+                name='enroll_active_course_idx'
+            ),
         ]
         ordering = ['-enrollment_date']
     
@@ -226,24 +348,27 @@ class Enrollment(models.Model):
     @property
     def attendance_rate(self):
         """Calculate attendance rate percentage"""
-        from apps.attendance.models import Attendance
-        total = Attendance.objects.filter(
-            enrollment=self
-        ).count()
+        total = getattr(self, 'att_total', None)
+        if total is not None:
+            present = self.att_present
+        else:
+            counts = self.attendance_records.aggregate(
+                total=models.Count('id'),
+                present=models.Count('id', filter=models.Q(status='present'))
+            )
+            total, present = counts['total'], counts['present']
         
         if total == 0:
             return None
         
-        present = Attendance.objects.filter(
-            enrollment=self,
-            status='present'
-        ).count()
-        
         return (present / total) * 100
     
     @property
     def total_paid(self):
         """Total amount paid for this enrollment"""
+        annotated = getattr(self, 'paid_total', None)
+        if annotated is not None:
+            return annotated
         from apps.payments.models import Payment
         return Payment.objects.filter(
             enrollment=self,
@@ -253,6 +378,9 @@ class Enrollment(models.Model):
     @property
     def total_due(self):
         """Total amount due for this enrollment"""
+        annotated = getattr(self, 'due_total', None)
+        if annotated is not None:
+            return annotated
         return self.course.fee_per_month * self.course.duration_months
     
     @property
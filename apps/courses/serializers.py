@@ -1,4 +1,5 @@
 # apps/courses/serializers.py
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from apps.courses.models import Course, Enrollment, CourseInstructor
 
@@ -36,23 +37,55 @@ class EnrollmentSerializer(serializers.ModelSerializer):
     
     def validate(self, data):
         """Validate enrollment"""
-        course = data.get('course')
+        # New enrollments are checked for capacity and duplicates in create()
+        if self.instance is not None:
+            if Enrollment.objects.filter(
+                student=data.get('student', self.instance.student_id),
+                course=data.get('course', self.instance.course_id),
+                status='active'
+            ).exclude(pk=self.instance.pk).exists():
+                raise serializers.ValidationError({
+                    'student': 'Student is already enrolled in this course'
+                })
         
-        # Check if course is full
-        if course and course.is_full:
+        return data
+    
+    @transaction.atomic
+    def create(self, validated_data):
+        # Lock the course row so concurrent enrollments can't both take the
+        # last seat; the duplicate check comes back on the same row
+        course = Course.objects.for_enrollment(
+            validated_data['student']
+        ).get(pk=validated_data['course'].pk)
+        if course.is_full:
             raise serializers.ValidationError({
                 'course': 'Course is at full capacity'
             })
-        
-        # Check for duplicate enrollment
-        student = data.get('student')
-        if Enrollment.objects.filter(
-            student=student,
-            course=course,
-            status='active'
-        ).exists():
+        if course.student_enrolled:
             raise serializers.ValidationError({
                 'student': 'Student is already enrolled in this course'
             })
-        
-        return data
+        # Backstop for a row created since UniqueTogetherValidator ran
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({
+                'student': 'Student already has an enrollment in this course'
+            })
+    
+    @transaction.atomic
+    def update(self, instance, validated_data):
+        course_id = validated_data['course'].pk if 'course' in validated_data else instance.course_id
+        status = validated_data.get('status', instance.status)
+        # Reactivating or moving an enrollment takes a seat in the target
+        # course, so check it under the same lock as create()
+        if course_id != instance.course_id or (status == 'active' and instance.status != 'active'):
+            course = Course.objects.for_enrollment(
+                validated_data.get('student', instance.student_id)
+            ).get(pk=course_id)
+            if course.is_full:
+                raise serializers.ValidationError({
+                    'course': 'Course is at full capacity'
+                })
+        return super().update(instance, validated_data)
@@ -0,0 +1,44 @@
+# apps/courses/signals.py
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Course, Enrollment
+
+
+def _adjust_active_count(course_id, delta):
+    Course.objects.filter(pk=course_id).update(
+        active_enrollment_count=Greatest(F('active_enrollment_count') + delta, 0)
+    )
+
+
+@receiver(pre_save, sender=Enrollment)
+def remember_enrollment_seat(sender, instance, raw=False, **kwargs):
+    """Note which course (if any) the row held an active seat in before saving"""
+    instance._active_course_id = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._active_course_id = Enrollment.objects.filter(
+        pk=instance.pk, status='active'
+    ).values_list('course_id', flat=True).first()
+
+
+@receiver(post_save, sender=Enrollment)
+def update_active_count_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    was = getattr(instance, '_active_course_id', None)
+    now = instance.course_id if instance.status == 'active' else None
+    if was == now:
+        return
+    if was is not None:
+        _adjust_active_count(was, -1)
+    if now is not None:
+        _adjust_active_count(now, 1)
+
+
+@receiver(post_delete, sender=Enrollment)
+def update_active_count_on_delete(sender, instance, **kwargs):
+    if instance.status == 'active':
+        _adjust_active_count(instance.course_id, -1)
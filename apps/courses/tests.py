@@ -1,3 +1,157 @@
+from datetime import date, time
+from decimal import Decimal
+
+from django.contrib import admin
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.accounts.models import User
+from apps.courses.admin import EnrollmentAdmin
+from apps.courses.models import Course, Enrollment
+from apps.students.models import Student
+
+
+def make_student(n):
+    return Student.objects.create(
+        full_name=f'Test Student {n}',
+        gender='F',
+        parent_name='Test Parent',
+        parent_phone='+212600000002',
+        education_level='high',
+    )
+
+
+def make_course(n, **kwargs):
+    return Course.objects.create(**{
+        'course_name': f'Test Course {n}',
+        'course_type': 'academic',
+        'subject': 'Mathematics',
+        'fee_per_month': Decimal('300.00'),
+        'schedule_time': time(10, 0),
+        'start_date': date(2031, 1, 1),
+        'end_date': date(2031, 6, 30),
+        **kwargs
+    })
+
+
+class ActiveEnrollmentCountTests(TestCase):
+    """Course.active_enrollment_count follows enrollment writes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = make_course(1)
+        cls.other_course = make_course(2)
+        cls.students = [make_student(n) for n in range(4)]
+
+    def assert_counts(self, course, other_course):
+        self.course.refresh_from_db()
+        self.other_course.refresh_from_db()
+        self.assertEqual(self.course.active_enrollment_count, course)
+        self.assertEqual(self.other_course.active_enrollment_count, other_course)
+
+    def enroll(self, student, course=None, status='active'):
+        return Enrollment.objects.create(student=student, course=course or self.course, status=status)
+
+    def test_create(self):
+        self.enroll(self.students[0])
+        self.enroll(self.students[1])
+        self.enroll(self.students[2], status='suspended')
+        self.assert_counts(2, 0)
+
+    def test_status_change(self):
+        enrollment = self.enroll(self.students[0])
+
+        enrollment.status = 'dropped'
+        enrollment.save()
+        self.assert_counts(0, 0)
+
+        enrollment.status = 'active'
+        enrollment.save()
+        self.assert_counts(1, 0)
+
+        # Saving again without a change doesn't count the seat twice
+        enrollment.save()
+        self.assert_counts(1, 0)
+
+    def test_course_change(self):
+        enrollment = self.enroll(self.students[0])
+
+        enrollment.course = self.other_course
+        enrollment.save()
+        self.assert_counts(0, 1)
+
+    def test_delete(self):
+        active = self.enroll(self.students[0])
+        dropped = self.enroll(self.students[1], status='dropped')
+        self.assert_counts(1, 0)
+
+        dropped.delete()
+        self.assert_counts(1, 0)
+        active.delete()
+        self.assert_counts(0, 0)
+
+    def test_recount_enrollments(self):
+        self.enroll(self.students[0])
+        self.enroll(self.students[1], course=self.other_course)
+        Course.objects.filter(pk__in=[self.course.pk, self.other_course.pk]).update(
+            active_enrollment_count=7
+        )
+
+        Course.objects.filter(pk__in=[self.course.pk, self.other_course.pk]).recount_enrollments()
+
+        self.assert_counts(1, 1)
+
+    def test_bulk_enroll(self):
+        self.enroll(self.students[0])
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser(
+            email='test.courses.admin@example.com', password='test'
+        ))
+
+        response = client.post(
+            f'/api/courses/courses/{self.course.pk}/bulk_enroll/',
+            {'student_ids': [s.pk for s in self.students]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assert_counts(4, 0)
+
+    def test_bulk_enroll_reports_inactive_rows_apart(self):
+        self.enroll(self.students[0])
+        self.enroll(self.students[1], status='dropped')
+        self.enroll(self.students[2], status='completed')
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser(
+            email='test.courses.admin@example.com', password='test'
+        ))
+
+        response = client.post(
+            f'/api/courses/courses/{self.course.pk}/bulk_enroll/',
+            {'student_ids': [s.pk for s in self.students]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['enrolled'], [self.students[3].pk])
+        self.assertEqual(response.data['already_enrolled'], [self.students[0].pk])
+        self.assertEqual(
+            response.data['blocked_by_existing'],
+            [self.students[1].pk, self.students[2].pk]
+        )
+        self.assert_counts(2, 0)
+
+    def test_admin_status_actions(self):
+        for student in self.students[:3]:
+            self.enroll(student)
+        enrollment_admin = EnrollmentAdmin(Enrollment, admin.site)
+
+        enrollment_admin._update_status(
+            Enrollment.objects.filter(student__in=self.students[:2]), status='completed'
+        )
+        self.assert_counts(1, 0)
 
-# Create your tests here.
+        enrollment_admin._update_status(
+            Enrollment.objects.filter(student__in=self.students[:3]), status='active'
+        )
+        self.assert_counts(3, 0)
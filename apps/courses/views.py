@@ -1,24 +1,36 @@
 # apps/courses/views.py
+from datetime import date
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django.db import IntegrityError, transaction
 
+from apps.courses.filters import CourseFilter
 from apps.courses.models import Course, Enrollment
 from apps.courses.serializers import CourseSerializer, EnrollmentSerializer
+from apps.students.models import Student
+from config.filters import FullTextSearchFilter
+from config.pagination import CachedCountPagination
 
 
 class CourseViewSet(viewsets.ModelViewSet):
     """ViewSet for Course management"""
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['course_type', 'status', 'subject']
+    pagination_class = CachedCountPagination
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
+    filterset_class = CourseFilter
     search_fields = ['course_name', 'subject', 'description']
     ordering_fields = ['course_name', 'start_date', 'fee_per_month']
     ordering = ['-start_date']
     
+    def get_queryset(self):
+        # search_vector is only used in FullTextSearchFilter's WHERE clause
+        return super().get_queryset().defer('search_vector')
+    
     @action(detail=True, methods=['get'])
     def students(self, request, pk=None):
         """Get enrolled students"""
@@ -26,7 +38,11 @@ class CourseViewSet(viewsets.ModelViewSet):
         enrollments = Enrollment.objects.filter(
             course=course,
             status='active'
-        ).select_related('student')
+        ).select_related('student', 'course').only(
+            'enrollment_date', 'status', 'final_grade', 'completion_date',
+            'created_at', 'updated_at',
+            'student__full_name', 'course__course_name'
+        )
         
         serializer = EnrollmentSerializer(enrollments, many=True)
         return Response(serializer.data)
@@ -36,13 +52,6 @@ class CourseViewSet(viewsets.ModelViewSet):
         """Enroll a student in this course"""
         course = self.get_object()
         
-        # Check capacity
-        if course.is_full:
-            return Response(
-                {'error': 'Course is at full capacity'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
         student_id = request.data.get('student_id')
         if not student_id:
             return Response(
@@ -51,9 +60,6 @@ class CourseViewSet(viewsets.ModelViewSet):
             )
         
         # Create enrollment
-        from apps.students.models import Student
-        from datetime import date
-        
         try:
             student = Student.objects.get(id=student_id)
         except Student.DoesNotExist:
@@ -62,31 +68,116 @@ class CourseViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Check for duplicate
-        if Enrollment.objects.filter(
-            student=student,
-            course=course,
-            status='active'
-        ).exists():
+        with transaction.atomic():
+            # Lock the course row so concurrent requests can't overfill it;
+            # the duplicate check comes back on the same row
+            course = Course.objects.for_enrollment(student).get(pk=course.pk)
+            
+            # Check capacity
+            if course.is_full:
+                return Response(
+                    {'error': 'Course is at full capacity'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Check for duplicate
+            if course.student_enrolled:
+                return Response(
+                    {'error': 'Student already enrolled'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # unique (student, course) also rejects dropped/completed rows
+            try:
+                with transaction.atomic():
+                    enrollment = Enrollment.objects.create(
+                        student=student,
+                        course=course,
+                        enrollment_date=date.today(),
+                        status='active'
+                    )
+            except IntegrityError:
+                return Response(
+                    {'error': 'Student already has an enrollment in this course'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        serializer = EnrollmentSerializer(enrollment)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=True, methods=['post'])
+    def bulk_enroll(self, request, pk=None):
+        """Enroll several students in this course with a single INSERT"""
+        course = self.get_object()
+        
+        student_ids = request.data.get('student_ids')
+        if not isinstance(student_ids, list) or not student_ids:
+            return Response(
+                {'error': 'student_ids must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            student_ids = list(dict.fromkeys(int(i) for i in student_ids))
+        except (TypeError, ValueError):
             return Response(
-                {'error': 'Student already enrolled'},
+                {'error': 'student_ids must contain integers'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        enrollment = Enrollment.objects.create(
-            student=student,
-            course=course,
-            enrollment_date=date.today(),
-            status='active'
-        )
+        found = set(Student.objects.filter(id__in=student_ids).values_list('id', flat=True))
+        not_found = [i for i in student_ids if i not in found]
+        if not_found:
+            return Response(
+                {'error': 'Students not found', 'student_ids': not_found},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        serializer = EnrollmentSerializer(enrollment)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
+        with transaction.atomic():
+            # Same lock as enroll_student, so the seat check holds for the batch
+            course = Course.objects.select_for_update().get(pk=course.pk)
+            
+            # Any existing row blocks a new one (unique student/course); only
+            # active ones count as already enrolled
+            existing = dict(Enrollment.objects.filter(
+                course=course,
+                student_id__in=student_ids
+            ).values_list('student_id', 'status'))
+            new_ids = [i for i in student_ids if i not in existing]
+            
+            if len(new_ids) > course.max_students - course.active_enrollment_count:
+                return Response(
+                    {'error': 'Not enough seats for all students'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            today = date.today()
+            Enrollment.objects.bulk_create(
+                [
+                    Enrollment(student_id=i, course=course, enrollment_date=today, status='active')
+                    for i in new_ids
+                ],
+                batch_size=1000,
+                ignore_conflicts=True
+            )
+            # bulk_create doesn't send the signals that maintain the counter
+            Course.objects.filter(pk=course.pk).recount_enrollments()
+        
+        return Response(
+            {
+                'enrolled': new_ids,
+                'already_enrolled': [i for i in student_ids if existing.get(i) == 'active'],
+                'blocked_by_existing': [
+                    i for i in student_ids if i in existing and existing[i] != 'active'
+                ]
+            },
+            status=status.HTTP_201_CREATED
+        )
 
 
 class EnrollmentViewSet(viewsets.ModelViewSet):
     """ViewSet for Enrollment management"""
     queryset = Enrollment.objects.all().select_related('student', 'course')
     serializer_class = EnrollmentSerializer
+    pagination_class = CachedCountPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['student', 'course', 'status']
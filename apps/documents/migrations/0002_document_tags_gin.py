@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:43
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='document_tags_gin', opclasses=['jsonb_path_ops']),
+        ),
+    ]
@@ -1,5 +1,9 @@
 # apps/documents/models.py
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.core.cache import cache
 from django.db import models
+from django.template import engines
 from apps.accounts.models import User
 from datetime import date
 
@@ -67,6 +71,21 @@ class Document(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Maintained by the database; backs the API ?search= (FullTextSearchFilter)
+    search_vector = models.GeneratedField(
+        expression=SearchVector(
+            'title',
+            # "INV-2026-001" would otherwise index as inv, -2026, -001
+            models.Func(
+                'document_number', models.Value('-/_.'), models.Value('    '),
+                function='translate'
+            ),
+            config='simple'
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True
+    )
+    
     class Meta:
         indexes = [
             models.Index(fields=['document_type']),
@@ -74,6 +93,13 @@ class Document(models.Model):
             models.Index(fields=['related_model', 'related_id']),
             models.Index(fields=['status']),
             models.Index(fields=['document_date']),
+            # jsonb_path_ops only serves @>, i.e. tags__contains=[...]
+            GinIndex(
+                fields=['tags'],
+                opclasses=['jsonb_path_ops'],
+                name='document_tags_gin'
+            ),
+            GinIndex(fields=['search_vector'], name='document_search_vector_gin'),
         ]
         ordering = ['-document_date', '-created_at']
     
@@ -86,6 +112,11 @@ class Document(models.Model):
         return round(self.file_size / (1024 * 1024), 2)
 
 
+# Compiled html_template per process: pk -> (updated_at, Template). Compiled
+# templates don't pickle reliably, so they can't go to the shared cache.
+_compiled_templates = {}
+
+
 class DocumentTemplate(models.Model):
     """Template for generating documents"""
     TEMPLATE_TYPE_CHOICES = [
@@ -151,6 +182,50 @@ class DocumentTemplate(models.Model):
     def __str__(self):
         default = " (Default)" if self.is_default else ""
         return f"{self.name}{default}"
+    
+    @property
+    def compiled(self):
+        """html_template parsed once per process and saved version"""
+        cached = _compiled_templates.get(self.pk)
+        if cached is not None and cached[0] == self.updated_at:
+            return cached[1]
+        template = engines['django'].from_string(self.html_template)
+        if self.pk is not None:
+            _compiled_templates[self.pk] = (self.updated_at, template)
+        return template
+    
+    def render(self, context=None):
+        """Render html_template with the given context dict"""
+        return self.compiled.render(context)
+    
+    @classmethod
+    def forget_compiled(cls, pk):
+        _compiled_templates.pop(pk, None)
+    
+    DEFAULT_CACHE_KEY = 'documents:default_template:{}'
+    
+    @classmethod
+    def get_default(cls, template_type):
+        """Active default template for a type, cached until templates change"""
+        key = cls.DEFAULT_CACHE_KEY.format(template_type)
+        template = cache.get(key)
+        if template is None:
+            template = cls.objects.filter(
+                template_type=template_type,
+                is_default=True,
+                is_active=True
+            ).first()
+            if template is not None:
+                cache.set(key, template, None)
+        return template
+    
+    @classmethod
+    def invalidate_defaults(cls):
+        # Every type: a save may have moved a template between types
+        cache.delete_many([
+            cls.DEFAULT_CACHE_KEY.format(template_type)
+            for template_type, _ in cls.TEMPLATE_TYPE_CHOICES
+        ])
 
 
 class StudentDocument(models.Model):
@@ -0,0 +1,13 @@
+# apps/documents/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import DocumentTemplate
+
+
+@receiver(post_save, sender=DocumentTemplate)
+@receiver(post_delete, sender=DocumentTemplate)
+def invalidate_template_caches(sender, instance, **kwargs):
+    """Other processes drop stale compiled templates through updated_at"""
+    DocumentTemplate.forget_compiled(instance.pk)
+    DocumentTemplate.invalidate_defaults()
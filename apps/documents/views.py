@@ -1,6 +1,7 @@
 # apps/documents/views.py
-from rest_framework import viewsets, filters
+from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
+from config.filters import FullTextSearchFilter
 from .models import Document, DocumentTemplate
 from rest_framework import serializers
 
@@ -8,10 +9,20 @@ from rest_framework import serializers
 class DocumentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Document
-        fields = '__all__'
+        exclude = ['search_vector']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class DocumentListSerializer(serializers.ModelSerializer):
+    """Table columns only; matches the only() applied to the list queryset"""
+    class Meta:
+        model = Document
+        fields = [
+            'id', 'document_type', 'title', 'document_number',
+            'file_size', 'status', 'document_date', 'created_at'
+        ]
+
+
 class DocumentTemplateSerializer(serializers.ModelSerializer):
     class Meta:
         model = DocumentTemplate
@@ -19,14 +30,32 @@ class DocumentTemplateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
 
+class DocumentTemplateListSerializer(serializers.ModelSerializer):
+    """Everything but the template bodies, which the list defers"""
+    class Meta:
+        model = DocumentTemplate
+        exclude = ['html_template', 'css_styles']
+
+
 class DocumentViewSet(viewsets.ModelViewSet):
     """ViewSet for Document management"""
     queryset = Document.objects.all()
     serializer_class = DocumentSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['document_type', 'status', 'related_model']
     search_fields = ['title', 'document_number']
     ordering = ['-created_at']
+    
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'list':
+            qs = qs.only(*DocumentListSerializer.Meta.fields)
+        return qs
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return DocumentListSerializer
+        return DocumentSerializer
 
 
 class DocumentTemplateViewSet(viewsets.ModelViewSet):
@@ -35,4 +64,15 @@ class DocumentTemplateViewSet(viewsets.ModelViewSet):
     serializer_class = DocumentTemplateSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['template_type', 'is_active']
-    ordering = ['template_type', 'name']
\ No newline at end of file
+    ordering = ['template_type', 'name']
+    
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == 'list':
+            qs = qs.defer('html_template', 'css_styles')
+        return qs
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return DocumentTemplateListSerializer
+        return DocumentTemplateSerializer
@@ -1,21 +1,73 @@
 # apps/financials/admin.py
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from django.db.models import Sum
+from django.utils.safestring import mark_safe
+from django.db.models import F, Sum
+from datetime import date
 from .models import (
     InstructorPayment, MonthlyFinancial, 
     MemberDistribution, Expense, BudgetAllocation
 )
 
 
+class ListOnlyMixin:
+    """Load just list_only_fields for changelist rows; change forms still get whole rows"""
+    list_only_fields = ()
+    
+    def get_changelist(self, request, **kwargs):
+        changelist = super().get_changelist(request, **kwargs)
+        only = self.list_only_fields
+        if not only:
+            return changelist
+        
+        class OnlyChangeList(changelist):
+            def get_queryset(self, request, *args, **kwargs):
+                return super().get_queryset(request, *args, **kwargs).only(*only)
+        
+        return OnlyChangeList
+
+
+BADGE_HTML = '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px;">{}</span>'
+
+
+def status_badges(status_choices, colors):
+    """Map each status to its finished badge HTML"""
+    return {
+        status: format_html(BADGE_HTML, colors.get(status, 'gray'), label)
+        for status, label in status_choices
+    }
+
+
+PAYMENT_STATUS_COLORS = {
+    'pending': 'orange',
+    'approved': 'blue',
+    'paid': 'green',
+    'cancelled': 'gray'
+}
+INSTRUCTOR_PAYMENT_BADGES = status_badges(InstructorPayment.STATUS_CHOICES, PAYMENT_STATUS_COLORS)
+DISTRIBUTION_BADGES = status_badges(MemberDistribution.STATUS_CHOICES, PAYMENT_STATUS_COLORS)
+EXPENSE_BADGES = status_badges(Expense.STATUS_CHOICES, {
+    'pending': 'orange',
+    'approved': 'blue',
+    'paid': 'green',
+    'rejected': 'red'
+})
+
+
 @admin.register(InstructorPayment)
-class InstructorPaymentAdmin(admin.ModelAdmin):
+class InstructorPaymentAdmin(ListOnlyMixin, admin.ModelAdmin):
     """Admin interface for InstructorPayment"""
     list_display = [
         'instructor', 'period_month', 'total_hours',
         'gross_amount', 'net_amount', 'status_badge',
         'payment_date'
     ]
+    list_only_fields = [
+        'period_month', 'total_hours', 'gross_amount', 'net_amount',
+        'status', 'payment_date',
+        'instructor__full_name', 'instructor__specialization'
+    ]
     list_filter = [
         'status', 'period_month', 'payment_date', 'created_at'
     ]
@@ -66,22 +118,11 @@ class InstructorPaymentAdmin(admin.ModelAdmin):
     ]
     
     def status_badge(self, obj):
-        colors = {
-            'pending': 'orange',
-            'approved': 'blue',
-            'paid': 'green',
-            'cancelled': 'gray'
-        }
-        color = colors.get(obj.status, 'gray')
-        
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px;">{}</span>',
-            color, obj.get_status_display()
-        )
+        return INSTRUCTOR_PAYMENT_BADGES.get(obj.status) or format_html(BADGE_HTML, 'gray', obj.status)
     status_badge.short_description = 'Status'
     
     def approve_payments(self, request, queryset):
-        updated = queryset.filter(status='pending').update(status='approved')
+        updated = queryset.filter(status='pending').update(status='approved', updated_at=timezone.now())
         self.message_user(
             request, 
             f'{updated} payment(s) approved.'
@@ -89,10 +130,13 @@ class InstructorPaymentAdmin(admin.ModelAdmin):
     approve_payments.short_description = 'Approve selected payments'
     
     def mark_as_paid(self, request, queryset):
-        from datetime import date
         updated = queryset.filter(
             status='approved'
-        ).update(status='paid', payment_date=date.today())
+        ).update(
+            status='paid',
+            payment_date=date.today(),
+            updated_at=timezone.now()
+        )
         self.message_user(
             request, 
             f'{updated} payment(s) marked as paid.'
@@ -100,10 +144,14 @@ class InstructorPaymentAdmin(admin.ModelAdmin):
     mark_as_paid.short_description = 'Mark as Paid'
     
     def calculate_amounts(self, request, queryset):
-        count = 0
-        for payment in queryset:
-            payment.calculate_amounts()
-            count += 1
+        payments = list(
+            queryset.select_related('instructor').only(
+                'total_hours', 'hourly_rate', 'instructor__tax_rate_percentage'
+            )
+        )
+        for payment in payments:
+            payment.calculate_amounts(save=False)
+        count = InstructorPayment.objects.update_amounts(payments)
         
         self.message_user(
             request, 
@@ -118,13 +166,18 @@ class InstructorPaymentAdmin(admin.ModelAdmin):
 
 
 @admin.register(MonthlyFinancial)
-class MonthlyFinancialAdmin(admin.ModelAdmin):
+class MonthlyFinancialAdmin(ListOnlyMixin, admin.ModelAdmin):
     """Admin interface for MonthlyFinancial"""
     list_display = [
         'period_month', 'total_revenue', 'total_expenses',
         'gross_profit', 'distributable_profit', 
         'is_finalized', 'finalized_date'
     ]
+    list_only_fields = [
+        'period_month', 'total_revenue', 'total_expenses',
+        'gross_profit', 'distributable_profit',
+        'is_finalized', 'finalized_date'
+    ]
     list_filter = [
         'is_finalized', 'period_month', 'finalized_date'
     ]
@@ -176,10 +229,13 @@ class MonthlyFinancialAdmin(admin.ModelAdmin):
     ]
     
     def finalize_periods(self, request, queryset):
-        from datetime import date
         updated = queryset.filter(
             is_finalized=False
-        ).update(is_finalized=True, finalized_date=date.today())
+        ).update(
+            is_finalized=True,
+            finalized_date=date.today(),
+            updated_at=timezone.now()
+        )
         self.message_user(
             request, 
             f'{updated} period(s) finalized.'
@@ -187,10 +243,17 @@ class MonthlyFinancialAdmin(admin.ModelAdmin):
     finalize_periods.short_description = 'Finalize selected periods'
     
     def recalculate_totals(self, request, queryset):
-        count = 0
-        for financial in queryset:
-            financial.calculate_totals()
-            count += 1
+        # Same arithmetic as MonthlyFinancial.calculate_totals, as one UPDATE
+        total_expenses = (
+            F('instructor_payments') +
+            F('operational_expenses') +
+            F('other_expenses')
+        )
+        count = queryset.update(
+            total_expenses=total_expenses,
+            gross_profit=F('total_revenue') - total_expenses,
+            updated_at=timezone.now()
+        )
         
         self.message_user(
             request, 
@@ -200,13 +263,19 @@ class MonthlyFinancialAdmin(admin.ModelAdmin):
 
 
 @admin.register(MemberDistribution)
-class MemberDistributionAdmin(admin.ModelAdmin):
+class MemberDistributionAdmin(ListOnlyMixin, admin.ModelAdmin):
     """Admin interface for MemberDistribution"""
     list_display = [
         'member', 'period', 'share_percentage',
         'amount', 'status_badge', 'is_public_employee',
         'payment_date'
     ]
+    list_only_fields = [
+        'share_percentage', 'amount', 'status', 'is_public_employee',
+        'payment_date',
+        'member__full_name', 'member__membership_number',
+        'monthly_financial__period_month'
+    ]
     list_filter = [
         'status', 'is_public_employee', 
         'monthly_financial__period_month', 'payment_date'
@@ -255,18 +324,7 @@ class MemberDistributionAdmin(admin.ModelAdmin):
     period.short_description = 'Period'
     
     def status_badge(self, obj):
-        colors = {
-            'pending': 'orange',
-            'approved': 'blue',
-            'paid': 'green',
-            'cancelled': 'gray'
-        }
-        color = colors.get(obj.status, 'gray')
-        
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px;">{}</span>',
-            color, obj.get_status_display()
-        )
+        return DISTRIBUTION_BADGES.get(obj.status) or format_html(BADGE_HTML, 'gray', obj.status)
     status_badge.short_description = 'Status'
     
     actions = [
@@ -279,7 +337,7 @@ class MemberDistributionAdmin(admin.ModelAdmin):
         updated = queryset.filter(
             status='pending',
             is_public_employee=False
-        ).update(status='approved')
+        ).update(status='approved', updated_at=timezone.now())
         self.message_user(
             request, 
             f'{updated} distribution(s) approved.'
@@ -287,10 +345,13 @@ class MemberDistributionAdmin(admin.ModelAdmin):
     approve_distributions.short_description = 'Approve selected distributions'
     
     def mark_as_paid(self, request, queryset):
-        from datetime import date
         updated = queryset.filter(
             status='approved'
-        ).update(status='paid', payment_date=date.today())
+        ).update(
+            status='paid',
+            payment_date=date.today(),
+            updated_at=timezone.now()
+        )
         self.message_user(
             request, 
             f'{updated} distribution(s) marked as paid.'
@@ -304,13 +365,17 @@ class MemberDistributionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Expense)
-class ExpenseAdmin(admin.ModelAdmin):
+class ExpenseAdmin(ListOnlyMixin, admin.ModelAdmin):
     """Admin interface for Expense"""
     list_display = [
         'expense_date', 'category', 'description',
         'amount', 'status_badge', 'payment_date',
         'receipt_number'
     ]
+    list_only_fields = [
+        'expense_date', 'category', 'description', 'amount',
+        'status', 'payment_date', 'receipt_number'
+    ]
     list_filter = [
         'category', 'status', 'expense_date', 
         'payment_date', 'period_month'
@@ -365,26 +430,15 @@ class ExpenseAdmin(admin.ModelAdmin):
     ]
     
     def status_badge(self, obj):
-        colors = {
-            'pending': 'orange',
-            'approved': 'blue',
-            'paid': 'green',
-            'rejected': 'red'
-        }
-        color = colors.get(obj.status, 'gray')
-        
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px;">{}</span>',
-            color, obj.get_status_display()
-        )
+        return EXPENSE_BADGES.get(obj.status) or format_html(BADGE_HTML, 'gray', obj.status)
     status_badge.short_description = 'Status'
     
     def approve_expenses(self, request, queryset):
-        from datetime import date
         updated = queryset.filter(status='pending').update(
             status='approved',
             approved_by=request.user.full_name or request.user.email,
-            approval_date=date.today()
+            approval_date=date.today(),
+            updated_at=timezone.now()
         )
         self.message_user(
             request, 
@@ -393,10 +447,13 @@ class ExpenseAdmin(admin.ModelAdmin):
     approve_expenses.short_description = 'Approve selected expenses'
     
     def mark_as_paid(self, request, queryset):
-        from datetime import date
         updated = queryset.filter(
             status='approved'
-        ).update(status='paid', payment_date=date.today())
+        ).update(
+            status='paid',
+            payment_date=date.today(),
+            updated_at=timezone.now()
+        )
         self.message_user(
             request, 
             f'{updated} expense(s) marked as paid.'
@@ -404,7 +461,7 @@ class ExpenseAdmin(admin.ModelAdmin):
     mark_as_paid.short_description = 'Mark as Paid'
     
     def reject_expenses(self, request, queryset):
-        updated = queryset.filter(status='pending').update(status='rejected')
+        updated = queryset.filter(status='pending').update(status='rejected', updated_at=timezone.now())
         self.message_user(
             request, 
             f'{updated} expense(s) rejected.'
@@ -413,13 +470,14 @@ class ExpenseAdmin(admin.ModelAdmin):
 
 
 @admin.register(BudgetAllocation)
-class BudgetAllocationAdmin(admin.ModelAdmin):
+class BudgetAllocationAdmin(ListOnlyMixin, admin.ModelAdmin):
     """Admin interface for BudgetAllocation"""
     list_display = [
         'period_month', 'category', 'allocated_amount',
         'spent_display', 'remaining_display', 
         'utilization_display'
     ]
+    list_only_fields = ['period_month', 'category', 'allocated_amount']
     list_filter = [
         'category', 'period_month', 'created_at'
     ]
@@ -448,27 +506,25 @@ class BudgetAllocationAdmin(admin.ModelAdmin):
     list_per_page = 50
     
     def spent_display(self, obj):
+        # Decimal amounts and literal colours only, so nothing needs escaping
         spent = obj.spent_amount
-        return format_html(
-            '<strong>{} DH</strong>',
-            spent
-        )
+        return mark_safe(f'<strong>{spent} DH</strong>')
     spent_display.short_description = 'Spent'
+    spent_display.admin_order_field = 'spent_total'
     
     def remaining_display(self, obj):
         remaining = obj.remaining_budget
         color = 'green' if remaining > 0 else 'red'
-        return format_html(
-            '<span style="color: {};">{} DH</span>',
-            color, remaining
-        )
+        return mark_safe(f'<span style="color: {color};">{remaining} DH</span>')
     remaining_display.short_description = 'Remaining'
     
     def utilization_display(self, obj):
         utilization = obj.utilization_percentage
         color = 'green' if utilization < 80 else 'orange' if utilization < 100 else 'red'
-        return format_html(
-            '<span style="color: {};">{}%</span>',
-            color, int(utilization)
-        )
-    utilization_display.short_description = 'Utilization'
\ No newline at end of file
+        return mark_safe(f'<span style="color: {color};">{int(utilization)}%</span>')
+    utilization_display.short_description = 'Utilization'
+    
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        qs = qs.with_spent()
+        return qs
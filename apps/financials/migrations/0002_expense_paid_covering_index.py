@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financials', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(condition=models.Q(('status', 'paid')), fields=['period_month', 'category'], include=('amount',), name='exp_budget_cover_idx'),
+        ),
+    ]
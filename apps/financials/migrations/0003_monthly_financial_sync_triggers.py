@@ -0,0 +1,103 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:50
+
+from django.db import migrations
+
+
+CREATE_TRIGGERS = """
+-- Recompute the expense columns of the (unfinalized) monthly summaries for
+-- the given months. FinancialCalculationService.calculate_monthly_profit
+-- (apps/financials/services.py) is the source of truth for these sums; keep
+-- the filters below in step with it
+CREATE FUNCTION financials_sync_monthly(months date[]) RETURNS void
+LANGUAGE sql AS $$
+    UPDATE financials_monthlyfinancial AS mf
+    SET operational_expenses = s.operational,
+        instructor_payments = s.instructor,
+        total_expenses = s.instructor + s.operational + mf.other_expenses,
+        gross_profit = mf.total_revenue - (s.instructor + s.operational + mf.other_expenses),
+        updated_at = now()
+    FROM (
+        SELECT
+            m AS period_month,
+            COALESCE((
+                SELECT sum(amount) FROM financials_expense
+                WHERE period_month = m AND status = 'paid'
+            ), 0) AS operational,
+            COALESCE((
+                SELECT sum(net_amount) FROM financials_instructorpayment
+                WHERE period_month = m AND status IN ('approved', 'paid')
+            ), 0) AS instructor
+        FROM unnest(months) AS m
+    ) AS s
+    WHERE mf.period_month = s.period_month
+      AND NOT mf.is_finalized;
+$$;
+
+-- Statement-level, so a bulk admin action recomputes each month once
+CREATE FUNCTION financials_sync_monthly_trigger() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM financials_sync_monthly(ARRAY(SELECT DISTINCT period_month FROM new_rows));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM financials_sync_monthly(ARRAY(
+            SELECT period_month FROM new_rows
+            UNION
+            SELECT period_month FROM old_rows
+        ));
+    ELSE
+        PERFORM financials_sync_monthly(ARRAY(SELECT DISTINCT period_month FROM old_rows));
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Transition tables allow one event per trigger
+CREATE TRIGGER expense_sync_monthly_insert
+    AFTER INSERT ON financials_expense
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION financials_sync_monthly_trigger();
+CREATE TRIGGER expense_sync_monthly_update
+    AFTER UPDATE ON financials_expense
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION financials_sync_monthly_trigger();
+CREATE TRIGGER expense_sync_monthly_delete
+    AFTER DELETE ON financials_expense
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION financials_sync_monthly_trigger();
+
+CREATE TRIGGER instructorpayment_sync_monthly_insert
+    AFTER INSERT ON financials_instructorpayment
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION financials_sync_monthly_trigger();
+CREATE TRIGGER instructorpayment_sync_monthly_update
+    AFTER UPDATE ON financials_instructorpayment
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION financials_sync_monthly_trigger();
+CREATE TRIGGER instructorpayment_sync_monthly_delete
+    AFTER DELETE ON financials_instructorpayment
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION financials_sync_monthly_trigger();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS expense_sync_monthly_insert ON financials_expense;
+DROP TRIGGER IF EXISTS expense_sync_monthly_update ON financials_expense;
+DROP TRIGGER IF EXISTS expense_sync_monthly_delete ON financials_expense;
+DROP TRIGGER IF EXISTS instructorpayment_sync_monthly_insert ON financials_instructorpayment;
+DROP TRIGGER IF EXISTS instructorpayment_sync_monthly_update ON financials_instructorpayment;
+DROP TRIGGER IF EXISTS instructorpayment_sync_monthly_delete ON financials_instructorpayment;
+DROP FUNCTION IF EXISTS financials_sync_monthly_trigger();
+DROP FUNCTION IF EXISTS financials_sync_monthly(date[]);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financials', '0002_expense_paid_covering_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_TRIGGERS, DROP_TRIGGERS),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financials', '0004_expense_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['period_month', 'status'], name='exp_period_status_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('financials', '0005_expense_period_status_index'),
+        ('instructors', '0003_composite_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='instructorpayment',
+            index=models.Index(fields=['period_month', 'status'], name='ip_period_status_idx'),
+        ),
+    ]
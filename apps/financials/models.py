@@ -1,5 +1,9 @@
 # apps/financials/models.py
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import connections, models, router, transaction
+from django.db.models.functions import Coalesce, Upper
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.core.validators import MinValueValidator
 from decimal import Decimal
 from datetime import date
@@ -7,6 +11,46 @@ from apps.instructors.models import Instructor
 from apps.members.models import Member
 
 
+_HUNDREDTH = Decimal('0.01')  # percentage -> fraction
+
+
+class InstructorPaymentQuerySet(models.QuerySet):
+    """QuerySet helpers for instructor payments"""
+    
+    def update_amounts(self, payments, batch_size=1000):
+        """Write back calculated amounts, as one UPDATE ... FROM (VALUES ...) per batch on PostgreSQL"""
+        now = timezone.now()  # neither path goes through auto_now
+        for payment in payments:
+            payment.updated_at = now
+        
+        db = self._db or router.db_for_write(self.model)
+        connection = connections[db]
+        if connection.vendor != 'postgresql':
+            return self.using(db).bulk_update(
+                payments,
+                ['gross_amount', 'tax_amount', 'net_amount', 'updated_at'],
+                batch_size=batch_size
+            )
+        
+        table = self.model._meta.db_table
+        with transaction.atomic(using=db), connection.cursor() as cursor:
+            for start in range(0, len(payments), batch_size):
+                batch = payments[start:start + batch_size]
+                # bulk_update would build a CASE WHEN per column instead
+                rows = ', '.join(['(%s, %s::numeric, %s::numeric, %s::numeric)'] * len(batch))
+                params = []
+                for payment in batch:
+                    params += [payment.pk, payment.gross_amount, payment.tax_amount, payment.net_amount]
+                cursor.execute(
+                    f'UPDATE {table} AS t '
+                    f'SET gross_amount = v.gross, tax_amount = v.tax, net_amount = v.net, updated_at = %s '
+                    f'FROM (VALUES {rows}) AS v(id, gross, tax, net) '
+                    f'WHERE t.id = v.id',
+                    [now] + params
+                )
+        return len(payments)
+
+
 class InstructorPayment(models.Model):
     """Monthly payment record for instructors"""
     STATUS_CHOICES = [
@@ -72,6 +116,8 @@ class InstructorPayment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = InstructorPaymentQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('instructor', 'period_month')
         indexes = [
@@ -79,18 +125,23 @@ class InstructorPayment(models.Model):
             models.Index(fields=['period_month']),
             models.Index(fields=['status']),
             models.Index(fields=['payment_date']),
+            # Approved/paid totals per period (monthly profit, sync triggers)
+            models.Index(fields=['period_month', 'status'], name='ip_period_status_idx'),
         ]
         ordering = ['-period_month', 'instructor__full_name']
     
     def __str__(self):
         return f"{self.instructor.full_name} - {self.period_month.strftime('%B %Y')} - {self.net_amount} DH"
     
-    def calculate_amounts(self):
+    def calculate_amounts(self, save=True):
         """Calculate gross, tax, and net amounts"""
         self.gross_amount = self.total_hours * self.hourly_rate
-        self.tax_amount = self.gross_amount * (self.instructor.tax_rate_percentage / 100)
+        self.tax_amount = self.gross_amount * self.instructor.tax_rate_percentage * _HUNDREDTH
         self.net_amount = self.gross_amount - self.tax_amount
-        self.save()
+        if save:
+            self.save(update_fields=None if self._state.adding else [
+                'gross_amount', 'tax_amount', 'net_amount', 'updated_at'
+            ])
 
 
 class MonthlyFinancial(models.Model):
@@ -110,7 +161,9 @@ class MonthlyFinancial(models.Model):
         help_text="Total student payments received"
     )
     
-    # Expenses
+    # Expenses; instructor_payments, operational_expenses, total_expenses and
+    # gross_profit are kept current by database triggers on expense and
+    # instructor payment changes (migration 0003) until the period is finalized
     instructor_payments = models.DecimalField(
         max_digits=12,
         decimal_places=2,
@@ -193,7 +246,9 @@ class MonthlyFinancial(models.Model):
             self.other_expenses
         )
         self.gross_profit = self.total_revenue - self.total_expenses
-        self.save()
+        self.save(update_fields=None if self._state.adding else [
+            'total_expenses', 'gross_profit', 'updated_at'
+        ])
     
     @property
     def profit_margin(self):
@@ -203,6 +258,39 @@ class MonthlyFinancial(models.Model):
         return Decimal('0')
 
 
+class MemberDistributionQuerySet(models.QuerySet):
+    """QuerySet helpers for member distributions"""
+    
+    def bulk_create_for_period(self, distributions, batch_size=1000):
+        """Insert or refresh a period's distributions in one statement per batch"""
+        # save() isn't called, so stamp is_public_employee here, loading any
+        # members the objects don't already carry in one query
+        missing = {
+            d.member_id for d in distributions
+            if not MemberDistribution.member.is_cached(d)
+        }
+        statuses = dict(
+            Member.objects.filter(pk__in=missing).values_list('pk', 'employment_status')
+        ) if missing else {}
+        for d in distributions:
+            if MemberDistribution.member.is_cached(d):
+                employment_status = d.member.employment_status
+            else:
+                employment_status = statuses.get(d.member_id)
+            d.is_public_employee = (employment_status == 'public')
+        
+        return self.bulk_create(
+            distributions,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['member', 'monthly_financial'],
+            update_fields=[
+                'share_percentage', 'amount', 'status',
+                'is_public_employee', 'updated_at'
+            ]
+        )
+
+
 class MemberDistribution(models.Model):
     """Profit distribution to cooperative members"""
     STATUS_CHOICES = [
@@ -254,6 +342,8 @@ class MemberDistribution(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = MemberDistributionQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('member', 'monthly_financial')
         indexes = [
@@ -268,8 +358,14 @@ class MemberDistribution(models.Model):
         return f"{self.member.full_name} - {period} - {self.amount} DH"
     
     def save(self, *args, **kwargs):
-        # Set public employee flag from member
-        self.is_public_employee = (self.member.employment_status == 'public')
+        # Set public employee flag from member (just that column if not loaded)
+        if MemberDistribution.member.is_cached(self):
+            employment_status = self.member.employment_status
+        else:
+            employment_status = Member.objects.values_list(
+                'employment_status', flat=True
+            ).get(pk=self.member_id)
+        self.is_public_employee = (employment_status == 'public')
         super().save(*args, **kwargs)
 
 
@@ -331,6 +427,25 @@ class Expense(models.Model):
             models.Index(fields=['expense_date']),
             models.Index(fields=['period_month']),
             models.Index(fields=['status']),
+            # Changelist filtered by period and status together
+            models.Index(fields=['period_month', 'status'], name='exp_period_status_idx'),
+            # Paid totals per month/category (budget spent, monthly expenses)
+            # answered from the index alone
+            models.Index(
+                fields=['period_month', 'category'],
+                include=['amount'],
+                condition=models.Q(status='paid'),
+                name='exp_budget_cover_idx'
+            ),
+            # Trigram indexes backing admin search (icontains -> UPPER(col) LIKE)
+            GinIndex(
+                OpClass(Upper('description'), name='gin_trgm_ops'),
+                name='financials_exp_desc_trgm'
+            ),
+            GinIndex(
+                OpClass(Upper('receipt_number'), name='gin_trgm_ops'),
+                name='financials_exp_receipt_trgm'
+            ),
         ]
         ordering = ['-expense_date', '-created_at']
     
@@ -338,6 +453,27 @@ class Expense(models.Model):
         return f"{self.category} - {self.amount} DH - {self.expense_date}"
 
 
+class BudgetAllocationQuerySet(models.QuerySet):
+    """QuerySet helpers for budget allocations"""
+    
+    def with_spent(self):
+        """Annotate spent_total, which spent_amount/remaining_budget/utilization prefer"""
+        spent = Expense.objects.filter(
+            period_month=models.OuterRef('period_month'),
+            category=models.OuterRef('category'),
+            status='paid'
+        ).order_by().values('period_month', 'category').annotate(
+            total=models.Sum('amount')
+        ).values('total')
+        
+        return self.annotate(
+            spent_total=Coalesce(
+                models.Subquery(spent), Decimal('0'),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
+
 class BudgetAllocation(models.Model):
     """Monthly budget allocation by category"""
     period_month = models.DateField(help_text="Budget month")
@@ -355,6 +491,8 @@ class BudgetAllocation(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = BudgetAllocationQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('period_month', 'category')
         indexes = [
@@ -365,9 +503,12 @@ class BudgetAllocation(models.Model):
     def __str__(self):
         return f"{self.period_month.strftime('%B %Y')} - {self.category} - {self.allocated_amount} DH"
     
-    @property
+    @cached_property
     def spent_amount(self):
-        """Total spent in this category for the period"""
+        """Total spent in this category for the period (computed once per instance)"""
+        annotated = getattr(self, 'spent_total', None)
+        if annotated is not None:
+            return annotated
         return Expense.objects.filter(
             period_month=self.period_month,
             category=self.category,
@@ -1,7 +1,10 @@
 # apps/financials/services.py
 from decimal import Decimal
 from datetime import date, timedelta
-from django.db.models import Sum, Count, Q
+from functools import lru_cache
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Sum, Q
 from django.utils import timezone
 
 from apps.financials.models import (
@@ -11,7 +14,16 @@ from apps.financials.models import (
 from apps.instructors.models import Instructor
 from apps.members.models import Member
 from apps.payments.models import Payment
-from apps.courses.models import CourseInstructor
+
+
+DASHBOARD_KPIS_CACHE_TIMEOUT = 30  # seconds; KPIs may lag by this much
+
+
+@lru_cache(maxsize=512)
+def _month_bounds(year, month):
+    """First and last day of the given month"""
+    next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(year, month, 1), next_month - timedelta(days=1)
 
 
 class FinancialCalculationService:
@@ -29,42 +41,44 @@ class FinancialCalculationService:
             List of created InstructorPayment objects
         """
         # Get first and last day of the period
-        first_day = period_month.replace(day=1)
-        if period_month.month == 12:
-            last_day = period_month.replace(year=period_month.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            last_day = period_month.replace(month=period_month.month + 1, day=1) - timedelta(days=1)
-        
-        payments = []
+        first_day, last_day = _month_bounds(period_month.year, period_month.month)
         
-        # Get all active instructors
-        instructors = Instructor.objects.filter(status='active')
+        # Hours per active instructor for the period, in one grouped query;
+        # the filter comes first so it restricts the rows being summed, and
+        # only the rate columns the amounts need are loaded
+        instructors = Instructor.objects.filter(
+            status='active',
+            instructor_courses__course__start_date__lte=last_day,
+            instructor_courses__course__end_date__gte=first_day
+        ).annotate(
+            period_hours=Sum('instructor_courses__hours_taught')
+        ).filter(period_hours__gt=0).only(
+            'hourly_rate', 'tax_rate_percentage'
+        ).order_by()
         
+        payments = []
         for instructor in instructors:
-            # Calculate total hours for the period
-            total_hours = CourseInstructor.objects.filter(
+            payment = InstructorPayment(
                 instructor=instructor,
-                course__start_date__lte=last_day,
-                course__end_date__gte=first_day
-            ).aggregate(
-                total=Sum('hours_taught')
-            )['total'] or Decimal('0')
-            
-            if total_hours > 0:
-                # Create or update payment record
-                payment, created = InstructorPayment.objects.update_or_create(
-                    instructor=instructor,
-                    period_month=first_day,
-                    defaults={
-                        'total_hours': total_hours,
-                        'hourly_rate': instructor.hourly_rate,
-                        'status': 'pending'
-                    }
-                )
-                
-                # Calculate amounts
-                payment.calculate_amounts()
-                payments.append(payment)
+                period_month=first_day,
+                total_hours=instructor.period_hours,
+                hourly_rate=instructor.hourly_rate,
+                status='pending'
+            )
+            payment.calculate_amounts(save=False)
+            payments.append(payment)
+        
+        # Create or update every payment record in one statement per batch
+        InstructorPayment.objects.bulk_create(
+            payments,
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['instructor', 'period_month'],
+            update_fields=[
+                'total_hours', 'hourly_rate', 'status',
+                'gross_amount', 'tax_amount', 'net_amount', 'updated_at'
+            ]
+        )
         
         return payments
     
@@ -80,30 +94,28 @@ class FinancialCalculationService:
         Returns:
             MonthlyFinancial object
         """
-        first_day = period_month.replace(day=1)
-        if period_month.month == 12:
-            last_day = period_month.replace(year=period_month.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            last_day = period_month.replace(month=period_month.month + 1, day=1) - timedelta(days=1)
-        
-        # Calculate total revenue (paid payments)
-        total_revenue = Payment.objects.filter(
-            payment_date__gte=first_day,
-            payment_date__lte=last_day,
-            status='paid'
-        ).aggregate(total=Sum('amount_paid'))['total'] or Decimal('0')
-        
-        # Calculate instructor payments
-        instructor_payments_total = InstructorPayment.objects.filter(
-            period_month=first_day,
-            status__in=['approved', 'paid']
-        ).aggregate(total=Sum('net_amount'))['total'] or Decimal('0')
+        first_day, last_day = _month_bounds(period_month.year, period_month.month)
         
-        # Calculate operational expenses
-        operational_expenses = Expense.objects.filter(
-            period_month=first_day,
-            status='paid'
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
+        # Revenue (paid payments), instructor payments and operational
+        # expenses as scalar subqueries of a single statement
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    (SELECT COALESCE(SUM(amount_paid), 0) FROM {Payment._meta.db_table}
+                     WHERE payment_date BETWEEN %s AND %s AND status = %s),
+                    (SELECT COALESCE(SUM(net_amount), 0) FROM {InstructorPayment._meta.db_table}
+                     WHERE period_month = %s AND status IN (%s, %s)),
+                    (SELECT COALESCE(SUM(amount), 0) FROM {Expense._meta.db_table}
+                     WHERE period_month = %s AND status = %s)
+                """,
+                [
+                    first_day, last_day, 'paid',
+                    first_day, 'approved', 'paid',
+                    first_day, 'paid'
+                ]
+            )
+            total_revenue, instructor_payments_total, operational_expenses = cursor.fetchone()
         
         # Create or update monthly financial summary
         summary, created = MonthlyFinancial.objects.update_or_create(
@@ -140,31 +152,30 @@ class FinancialCalculationService:
         )
         
         # Calculate total share percentage
-        total_shares = sum(m.share_percentage for m in members)
+        total_shares = members.aggregate(total=Sum('share_percentage'))['total'] or 0
         
         if total_shares == 0:
             return []
         
         distributions = []
-        for member in members:
+        # Stream just what the amount and status need
+        for member in members.only(
+            'share_percentage', 'employment_status', 'status'
+        ).iterator(chunk_size=2000):
             # Calculate distribution amount
             share_percentage = member.share_percentage
             amount = (monthly_financial.distributable_profit * share_percentage) / 100
             
-            # Create distribution record
-            distribution, created = MemberDistribution.objects.update_or_create(
+            distributions.append(MemberDistribution(
                 member=member,
                 monthly_financial=monthly_financial,
-                defaults={
-                    'share_percentage': share_percentage,
-                    'amount': amount,
-                    'status': 'pending' if member.can_receive_profit else 'cancelled',
-                    'is_public_employee': member.employment_status == 'public'
-                }
-            )
-            distributions.append(distribution)
+                share_percentage=share_percentage,
+                amount=amount,
+                status='pending' if member.can_receive_profit else 'cancelled'
+            ))
         
-        return distributions
+        # One upsert for the period instead of update_or_create per member
+        return MemberDistribution.objects.bulk_create_for_period(distributions)
     
     @staticmethod
     def get_financial_summary(period_month):
@@ -189,35 +200,68 @@ class FinancialCalculationService:
     
     @staticmethod
     def get_dashboard_kpis():
-        """Get dashboard KPIs"""
+        """Get dashboard KPIs, cached briefly since the dashboard polls them"""
+        today = date.today()
+        return cache.get_or_set(
+            f'financials:dashboard_kpis:{today.isoformat()}',
+            lambda: FinancialCalculationService.dashboard_totals(today),
+            DASHBOARD_KPIS_CACHE_TIMEOUT
+        )
+    
+    @staticmethod
+    def dashboard_totals(today):
+        """
+        Read the dashboard counters with a single round-trip
+        
+        Shared by the KPI endpoint and the web dashboard. Two pending
+        payment figures are returned:
+            pending_balance: amount - amount_paid over every pending payment
+            overdue_payments_amount: full amount of pending payments due by today
+        """
         from apps.students.models import Student
         from apps.courses.models import Course, Enrollment
         
         # Current month
-        today = date.today()
         current_month = today.replace(day=1)
         
-        # Get current month summary
-        try:
-            current_summary = MonthlyFinancial.objects.get(period_month=current_month)
-        except MonthlyFinancial.DoesNotExist:
-            current_summary = None
-        
-        # Calculate pending payments
-        pending_payments = Payment.objects.filter(
-            status='pending',
-            due_date__lte=today
-        ).aggregate(
-            count=Count('id'),
-            total=Sum('amount')
-        )
+        # Counters and the current month summary as scalar subqueries
+        # alongside the pending payments aggregates
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT
+                    (SELECT COUNT(*) FROM {Student._meta.db_table} WHERE status = %s),
+                    (SELECT COUNT(*) FROM {Course._meta.db_table} WHERE status = %s),
+                    (SELECT COUNT(*) FROM {Enrollment._meta.db_table} WHERE status = %s),
+                    (SELECT total_revenue FROM {MonthlyFinancial._meta.db_table} WHERE period_month = %s),
+                    (SELECT gross_profit FROM {MonthlyFinancial._meta.db_table} WHERE period_month = %s),
+                    COUNT(*),
+                    SUM(amount - amount_paid),
+                    COUNT(*) FILTER (WHERE due_date <= %s),
+                    SUM(amount) FILTER (WHERE due_date <= %s)
+                FROM {Payment._meta.db_table}
+                WHERE status = %s
+                """,
+                [
+                    'active', 'active', 'active', current_month, current_month,
+                    today, today, 'pending'
+                ]
+            )
+            (
+                total_students, total_courses, total_enrollments,
+                current_revenue, current_profit,
+                pending_count, pending_balance,
+                overdue_count, overdue_total
+            ) = cursor.fetchone()
         
         return {
-            'total_students': Student.objects.filter(status='active').count(),
-            'total_courses': Course.objects.filter(status='active').count(),
-            'total_enrollments': Enrollment.objects.filter(status='active').count(),
-            'pending_payments_count': pending_payments['count'] or 0,
-            'pending_payments_amount': float(pending_payments['total'] or 0),
-            'current_month_revenue': float(current_summary.total_revenue) if current_summary else 0,
-            'current_month_profit': float(current_summary.gross_profit) if current_summary else 0
-        }
\ No newline at end of file
+            'total_students': total_students,
+            'total_courses': total_courses,
+            'total_enrollments': total_enrollments,
+            'pending_payments_count': pending_count or 0,
+            'pending_balance': float(pending_balance or 0),
+            'overdue_payments_count': overdue_count or 0,
+            'overdue_payments_amount': float(overdue_total or 0),
+            'current_month_revenue': float(current_revenue) if current_revenue is not None else 0,
+            'current_month_profit': float(current_profit) if current_profit is not None else 0
+        }
@@ -1,3 +1,255 @@
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connections
 from django.test import TestCase
+from django.utils import timezone
+
+from apps.financials.models import Expense, InstructorPayment, MonthlyFinancial
+from apps.financials.services import FinancialCalculationService
+from apps.instructors.models import Instructor
+from apps.payments.models import Payment
+from apps.students.models import Student
+
+
+def make_instructor(n, **kwargs):
+    return Instructor.objects.create(**{
+        'full_name': f'Test Instructor {n}',
+        'email': f'test.instructor{n}@example.com',
+        'phone': '+212600000001',
+        'specialization': 'Mathematics',
+        'qualifications': 'MSc',
+        'employment_type': 'part_time',
+        'hire_date': date(2020, 1, 1),
+        'hourly_rate': Decimal('100.00'),
+        **kwargs
+    })
+
+
+class UpdateAmountsTests(TestCase):
+    """InstructorPaymentQuerySet.update_amounts on both write paths"""
+
+    period = date(2031, 1, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.payments = []
+        for n, hours in enumerate([Decimal('10.00'), Decimal('7.50'), Decimal('0.00')]):
+            instructor = make_instructor(n, tax_rate_percentage=Decimal('15.00'))
+            cls.payments.append(InstructorPayment.objects.create(
+                instructor=instructor,
+                period_month=cls.period,
+                total_hours=hours,
+                hourly_rate=Decimal('120.00'),
+                gross_amount=Decimal('0'),
+                net_amount=Decimal('0'),
+            ))
+        # Backdate so the write is visible in updated_at
+        InstructorPayment.objects.filter(period_month=cls.period).update(
+            updated_at=timezone.now() - timedelta(days=1)
+        )
+
+    def recalculate(self):
+        payments = list(
+            InstructorPayment.objects.filter(period_month=self.period).select_related('instructor')
+        )
+        for payment in payments:
+            payment.calculate_amounts(save=False)
+        return payments
+
+    def assert_written(self, payments, started):
+        self.assertEqual(len(payments), 3)
+        for payment in payments:
+            row = InstructorPayment.objects.get(pk=payment.pk)
+            expected_gross = payment.total_hours * Decimal('120.00')
+            expected_tax = expected_gross * Decimal('0.15')
+            self.assertEqual(row.gross_amount, expected_gross)
+            self.assertEqual(row.tax_amount, expected_tax.quantize(Decimal('0.01')))
+            self.assertEqual(row.net_amount, (expected_gross - expected_tax).quantize(Decimal('0.01')))
+            self.assertGreaterEqual(row.updated_at, started)
+
+    def test_postgresql_update_from_values(self):
+        payments = self.recalculate()
+        started = timezone.now()
+
+        with self.assertNumQueries(4):  # savepoint, one UPDATE per batch, release
+            written = InstructorPayment.objects.update_amounts(payments, batch_size=2)
+
+        self.assertEqual(written, 3)
+        self.assert_written(payments, started)
+
+    def test_bulk_update_fallback(self):
+        payments = self.recalculate()
+        started = timezone.now()
+
+        with mock.patch.object(connections['default'], 'vendor', 'sqlite'):
+            written = InstructorPayment.objects.update_amounts(payments)
+
+        self.assertEqual(written, 3)
+        self.assert_written(payments, started)
+
+
+class MonthlyFinancialSyncTriggerTests(TestCase):
+    """Expense and instructor payment triggers keep MonthlyFinancial current (migration 0003)"""
+
+    period = date(2031, 2, 1)
+    other_period = date(2031, 3, 1)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.instructors = [make_instructor(n) for n in range(10, 13)]
+        cls.summary = MonthlyFinancial.objects.create(
+            period_month=cls.period,
+            total_revenue=Decimal('5000.00'),
+            other_expenses=Decimal('25.00'),
+        )
+        MonthlyFinancial.objects.create(period_month=cls.other_period)
+
+    def make_payment(self, instructor, net_amount, status='approved', period=None):
+        return InstructorPayment.objects.create(
+            instructor=instructor,
+            period_month=period or self.period,
+            total_hours=Decimal('1.00'),
+            hourly_rate=net_amount,
+            gross_amount=net_amount,
+            net_amount=net_amount,
+            status=status,
+        )
+
+    def make_expense(self, amount, status='paid', period=None):
+        return Expense.objects.create(
+            category='rent',
+            description='Test expense',
+            amount=amount,
+            expense_date=self.period,
+            period_month=period or self.period,
+            status=status,
+        )
+
+    def assert_synced(self, instructor_payments, operational_expenses, period=None):
+        summary = MonthlyFinancial.objects.get(period_month=period or self.period)
+        self.assertEqual(summary.instructor_payments, instructor_payments)
+        self.assertEqual(summary.operational_expenses, operational_expenses)
+        self.assertEqual(
+            summary.total_expenses,
+            instructor_payments + operational_expenses + summary.other_expenses
+        )
+        self.assertEqual(
+            summary.gross_profit,
+            summary.total_revenue - summary.total_expenses
+        )
+
+    def test_matches_calculate_monthly_profit(self):
+        self.make_payment(self.instructors[0], Decimal('300.00'), status='approved')
+        self.make_payment(self.instructors[1], Decimal('200.00'), status='paid')
+        self.make_payment(self.instructors[2], Decimal('999.00'), status='pending')
+        self.make_expense(Decimal('120.50'), status='paid')
+        self.make_expense(Decimal('80.00'), status='approved')
+        self.make_expense(Decimal('45.00'), status='rejected')
+        self.assert_synced(Decimal('500.00'), Decimal('120.50'))
+
+        triggered = MonthlyFinancial.objects.get(period_month=self.period)
+        recalculated = FinancialCalculationService.calculate_monthly_profit(self.period)
+
+        self.assertEqual(recalculated.instructor_payments, triggered.instructor_payments)
+        self.assertEqual(recalculated.operational_expenses, triggered.operational_expenses)
+
+    def test_bulk_create_update_conflicts(self):
+        self.make_payment(self.instructors[0], Decimal('100.00'))
+        self.assert_synced(Decimal('100.00'), Decimal('0'))
+
+        # One row conflicts (UPDATE), one is new (INSERT), in a single statement
+        InstructorPayment.objects.bulk_create(
+            [
+                InstructorPayment(
+                    instructor=instructor,
+                    period_month=self.period,
+                    total_hours=Decimal('1.00'),
+                    hourly_rate=net_amount,
+                    gross_amount=net_amount,
+                    net_amount=net_amount,
+                    status='approved',
+                )
+                for instructor, net_amount in [
+                    (self.instructors[0], Decimal('300.00')),
+                    (self.instructors[1], Decimal('50.00')),
+                ]
+            ],
+            update_conflicts=True,
+            unique_fields=['instructor', 'period_month'],
+            update_fields=['total_hours', 'hourly_rate', 'gross_amount', 'net_amount'],
+        )
+
+        self.assert_synced(Decimal('350.00'), Decimal('0'))
+
+    def test_queryset_update(self):
+        expenses = [self.make_expense(Decimal('70.00'), status='pending') for _ in range(3)]
+        self.assert_synced(Decimal('0'), Decimal('0'))
+
+        # As the admin approve/mark-paid actions do
+        Expense.objects.filter(pk__in=[e.pk for e in expenses]).update(
+            status='paid', updated_at=timezone.now()
+        )
+        self.assert_synced(Decimal('0'), Decimal('210.00'))
+
+        # Moving rows to another month recomputes both months
+        Expense.objects.filter(pk=expenses[0].pk).update(period_month=self.other_period)
+        self.assert_synced(Decimal('0'), Decimal('140.00'))
+        self.assert_synced(Decimal('0'), Decimal('70.00'), period=self.other_period)
+
+    def test_delete(self):
+        payment = self.make_payment(self.instructors[0], Decimal('400.00'))
+        self.make_expense(Decimal('60.00'))
+        self.make_expense(Decimal('40.00'))
+        self.assert_synced(Decimal('400.00'), Decimal('100.00'))
+
+        payment.delete()
+        Expense.objects.filter(period_month=self.period).delete()
+
+        self.assert_synced(Decimal('0'), Decimal('0'))
+
+    def test_finalized_period_untouched(self):
+        MonthlyFinancial.objects.filter(period_month=self.period).update(is_finalized=True)
+
+        self.make_payment(self.instructors[0], Decimal('400.00'))
+        self.make_expense(Decimal('60.00'))
+
+        summary = MonthlyFinancial.objects.get(period_month=self.period)
+        self.assertEqual(summary.instructor_payments, Decimal('0'))
+        self.assertEqual(summary.operational_expenses, Decimal('0'))
+
+
+class DashboardTotalsTests(TestCase):
+    """FinancialCalculationService.dashboard_totals keeps the two pending figures apart"""
+
+    def test_pending_balance_and_overdue_amount(self):
+        today = date(2031, 4, 15)
+        before = FinancialCalculationService.dashboard_totals(today)
+        student = Student.objects.create(
+            full_name='Test Student',
+            gender='M',
+            parent_name='Test Parent',
+            parent_phone='+212600000002',
+            education_level='middle',
+        )
+        # Due and part paid, not yet due, and a paid one that counts nowhere
+        for amount, amount_paid, due_date, status in [
+            (Decimal('300.00'), Decimal('100.00'), today, 'pending'),
+            (Decimal('500.00'), Decimal('0'), today + timedelta(days=1), 'pending'),
+            (Decimal('700.00'), Decimal('700.00'), today, 'paid'),
+        ]:
+            Payment.objects.create(
+                student=student,
+                amount=amount,
+                amount_paid=amount_paid,
+                due_date=due_date,
+                status=status,
+            )
+
+        after = FinancialCalculationService.dashboard_totals(today)
 
-# Create your tests here.
+        self.assertEqual(after['pending_payments_count'] - before['pending_payments_count'], 2)
+        self.assertAlmostEqual(after['pending_balance'] - before['pending_balance'], 700.0)
+        self.assertEqual(after['overdue_payments_count'] - before['overdue_payments_count'], 1)
+        self.assertAlmostEqual(after['overdue_payments_amount'] - before['overdue_payments_amount'], 300.0)
@@ -1,9 +1,8 @@
 # apps/instructors/admin.py
 from django.contrib import admin
 from django.utils.html import format_html
-from django.db.models import Count
-from .models import Instructor
 from django.db.models import Count, Q
+from .models import Instructor
 
 
 
@@ -74,9 +73,7 @@ class InstructorAdmin(admin.ModelAdmin):
     ]
     
     def active_courses_display(self, obj):
-        count = obj.instructor_courses.filter(
-            course__status='active'
-        ).count()
+        count = obj.active_courses_count  # annotated by get_queryset
         if count > 0:
             return format_html(
                 '<span style="color: green; font-weight: bold;">{}</span>',
@@ -84,6 +81,7 @@ class InstructorAdmin(admin.ModelAdmin):
             )
         return count
     active_courses_display.short_description = 'Active Courses'
+    active_courses_display.admin_order_field = 'active_course_count'
     
     def activate_instructors(self, request, queryset):
         updated = queryset.update(status='active')
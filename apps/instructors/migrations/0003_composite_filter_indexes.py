@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('instructors', '0002_instructor_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='instructor',
+            index=models.Index(fields=['status', 'specialization'], name='instr_status_spec_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='instructor',
+            index=models.Index(fields=['status', 'hire_date'], name='instr_status_hire_idx'),
+        ),
+    ]
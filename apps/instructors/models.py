@@ -1,9 +1,50 @@
 # apps/instructors/models.py
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Coalesce, Upper
 from django.core.validators import RegexValidator, MinValueValidator
 from decimal import Decimal
 
 
+class InstructorQuerySet(models.QuerySet):
+    """QuerySet helpers for instructors"""
+    
+    def with_stats(self):
+        """Annotate active_course_count, hours_taught_total and earnings_total, which the properties prefer"""
+        from apps.courses.models import CourseInstructor
+        from apps.financials.models import InstructorPayment
+        
+        # Subqueries rather than joins: courses and payments joined together
+        # would multiply each other's rows
+        assignments = CourseInstructor.objects.filter(
+            instructor=models.OuterRef('pk')
+        ).order_by().values('instructor')
+        active = assignments.filter(course__status='active').annotate(
+            total=models.Count('pk')
+        ).values('total')
+        hours = assignments.annotate(
+            total=models.Sum('hours_taught')
+        ).values('total')
+        earnings = InstructorPayment.objects.filter(
+            instructor=models.OuterRef('pk'),
+            status='paid'
+        ).order_by().values('instructor').annotate(
+            total=models.Sum('net_amount')
+        ).values('total')
+        
+        return self.annotate(
+            active_course_count=Coalesce(models.Subquery(active), 0),
+            hours_taught_total=Coalesce(
+                models.Subquery(hours), Decimal('0'),
+                output_field=models.DecimalField(max_digits=10, decimal_places=2)
+            ),
+            earnings_total=Coalesce(
+                models.Subquery(earnings), Decimal('0'),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
+
 class Instructor(models.Model):
     """Instructor model"""
     STATUS_CHOICES = [
@@ -67,6 +108,8 @@ class Instructor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = InstructorQuerySet.as_manager()
+    
     class Meta:
         # db_index = True
         # indexes = [
@@ -75,6 +118,16 @@ class Instructor(models.Model):
         #     models.Index(fields=['status']),
         #     models.Index(fields=['specialization']),
         # ]
+        indexes = [
+            # Trigram indexes backing admin search/autocomplete (icontains -> UPPER(col) LIKE)
+            GinIndex(
+                OpClass(Upper('full_name'), name='gin_trgm_ops'),
+                name='instructors_full_name_trgm'
+            ),
+            # Active instructors by specialization / hire date (admin filters)
+            models.Index(fields=['status', 'specialization'], name='instr_status_spec_idx'),
+            models.Index(fields=['status', 'hire_date'], name='instr_status_hire_idx'),
+        ]
         ordering = ['full_name']
     
     def __str__(self):
@@ -83,6 +136,9 @@ class Instructor(models.Model):
     @property
     def active_courses_count(self):
         """Number of active courses being taught"""
+        annotated = getattr(self, 'active_course_count', None)
+        if annotated is not None:
+            return annotated
         from apps.courses.models import CourseInstructor
         return CourseInstructor.objects.filter(
             instructor=self,
@@ -92,6 +148,9 @@ class Instructor(models.Model):
     @property
     def total_hours_taught(self):
         """Total hours taught across all courses"""
+        annotated = getattr(self, 'hours_taught_total', None)
+        if annotated is not None:
+            return annotated
         from apps.courses.models import CourseInstructor
         return CourseInstructor.objects.filter(
             instructor=self
@@ -100,6 +159,9 @@ class Instructor(models.Model):
     @property
     def total_earnings(self):
         """Total earnings from all payments"""
+        annotated = getattr(self, 'earnings_total', None)
+        if annotated is not None:
+            return annotated
         from apps.financials.models import InstructorPayment
         return InstructorPayment.objects.filter(
             instructor=self,
@@ -7,7 +7,7 @@ from .serializers import InstructorSerializer
 
 class InstructorViewSet(viewsets.ModelViewSet):
     """ViewSet for Instructor management"""
-    queryset = Instructor.objects.all()
+    queryset = Instructor.objects.with_stats()
     serializer_class = InstructorSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'employment_type', 'specialization']
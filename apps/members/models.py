@@ -1,9 +1,33 @@
 # apps/members/models.py
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Coalesce, Upper
 from django.core.validators import MinValueValidator, MaxValueValidator
 from decimal import Decimal
 
 
+class MemberQuerySet(models.QuerySet):
+    """QuerySet helpers for members"""
+    
+    def with_distributions(self):
+        """Annotate distributions_total, which total_distributions_received prefers"""
+        from apps.financials.models import MemberDistribution
+        
+        paid = MemberDistribution.objects.filter(
+            member=models.OuterRef('pk'),
+            status='paid'
+        ).order_by().values('member').annotate(
+            total=models.Sum('amount')
+        ).values('total')
+        
+        return self.annotate(
+            distributions_total=Coalesce(
+                models.Subquery(paid), Decimal('0'),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2)
+            )
+        )
+
+
 class Member(models.Model):
     """Cooperative member model"""
     EMPLOYMENT_STATUS_CHOICES = [
@@ -50,6 +74,8 @@ class Member(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = MemberQuerySet.as_manager()
+    
     class Meta:
         # db_index = True
         # indexes = [
@@ -57,6 +83,19 @@ class Member(models.Model):
         #     models.Index(fields=['status']),
         #     models.Index(fields=['employment_status']),
         # ]
+        indexes = [
+            # Trigram indexes backing admin search/autocomplete (icontains -> UPPER(col) LIKE)
+            GinIndex(
+                OpClass(Upper('full_name'), name='gin_trgm_ops'),
+                name='members_member_full_name_trgm'
+            ),
+            GinIndex(
+                OpClass(Upper('membership_number'), name='gin_trgm_ops'),
+                name='members_member_number_trgm'
+            ),
+            # Active members split by employment (profit distribution)
+            models.Index(fields=['status', 'employment_status'], name='member_status_employment_idx'),
+        ]
         ordering = ['full_name']
     
     def __str__(self):
@@ -70,6 +109,9 @@ class Member(models.Model):
     @property
     def total_distributions_received(self):
         """Calculate total profit distributions received"""
+        annotated = getattr(self, 'distributions_total', None)
+        if annotated is not None:
+            return annotated
         from apps.financials.models import MemberDistribution
         return MemberDistribution.objects.filter(
             member=self,
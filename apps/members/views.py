@@ -7,7 +7,7 @@ from .serializers import MemberSerializer
 
 class MemberViewSet(viewsets.ModelViewSet):
     """ViewSet for Member management"""
-    queryset = Member.objects.all()
+    queryset = Member.objects.with_distributions()
     serializer_class = MemberSerializer
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'employment_status']
@@ -88,6 +88,10 @@ class Payment(models.Model):
         #     models.Index(fields=['status']),
         #     models.Index(fields=['receipt_number']),
         # ]
+        indexes = [
+            # Paid revenue over a date range: equality column first, then the range
+            models.Index(fields=['status', 'payment_date'], name='payment_status_paid_date_idx'),
+        ]
         ordering = ['-due_date', '-created_at']
     
     def __str__(self):
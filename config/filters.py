@@ -0,0 +1,26 @@
+# config/filters.py
+import re
+
+from django.contrib.postgres.search import SearchQuery
+from rest_framework import filters
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """?search= against the view's indexed search_vector column instead of ILIKE"""
+    search_vector_field = 'search_vector'
+    
+    def filter_queryset(self, request, queryset, view):
+        words = [
+            word
+            for term in self.get_search_terms(request)
+            for word in re.findall(r'\w+', term)
+        ]
+        if not words:
+            return queryset
+        # Prefix-match every word so partial input ("math") still finds rows
+        query = SearchQuery(
+            ' & '.join(f'{word}:*' for word in words),
+            config='simple',
+            search_type='raw'
+        )
+        return queryset.filter(**{self.search_vector_field: query})
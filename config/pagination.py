@@ -0,0 +1,65 @@
+# config/pagination.py
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that trusts PostgreSQL's row estimate for large unfiltered tables"""
+    exact_count_threshold = 100000
+    
+    def estimated_count(self):
+        """pg_class.reltuples for an unfiltered, large table; None otherwise"""
+        if self.object_list.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [self.object_list.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 (or stale and small) until the table is analyzed
+        if row and row[0] >= self.exact_count_threshold:
+            return row[0]
+        return None
+    
+    def exact_count(self):
+        """COUNT(*) as the stock Paginator runs it"""
+        return super().count
+    
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None:
+            return estimate
+        return self.exact_count()
+
+
+class CachedCountPaginator(EstimatedCountPaginator):
+    """Estimated count, plus a short-lived cache of exact counts across page requests"""
+    count_cache_timeout = 60
+    
+    @cached_property
+    def count(self):
+        # Pages of the same listing/filter share one count for a short while
+        signature = hashlib.md5(str(self.object_list.query).encode()).hexdigest()
+        key = f'pagination:count:{self.object_list.model._meta.label_lower}:{signature}'
+        count = cache.get(key)
+        if count is not None:
+            return count
+        
+        estimate = self.estimated_count()
+        if estimate is not None:
+            return estimate
+        
+        count = self.exact_count()
+        cache.set(key, count, self.count_cache_timeout)
+        return count
+
+
+class CachedCountPagination(PageNumberPagination):
+    django_paginator_class = CachedCountPaginator
@@ -240,8 +240,24 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': timedelta(hours=24),  # Run daily
         'options': {'expires': 3600}
     },
+    'flush-api-key-usage': {
+        'task': 'apps.accounts.tasks.flush_api_key_usage_task',
+        'schedule': timedelta(minutes=1),
+        'options': {'expires': 60}
+    },
 }
 
+# APIKey.increment_usage writes straight to the DB unless this is enabled;
+# buffering requires a cache shared with the Celery workers.
+API_KEY_USAGE_BUFFERED = False
+
+# User activity stream (UserActivity.log_async -> consume_activity_stream)
+ACTIVITY_STREAM_REDIS_URL = os.getenv('ACTIVITY_STREAM_REDIS_URL', 'redis://localhost:6379/1')
+ACTIVITY_STREAM_NAME = 'user_activity'
+ACTIVITY_STREAM_MAXLEN = 100000
+# Events the consumer cannot insert are moved here instead of blocking the group
+ACTIVITY_STREAM_DEAD_LETTER_NAME = 'user_activity:dead'
+
 # Cache Configuration
 CACHES = {
     'default': {
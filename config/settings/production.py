@@ -79,6 +79,9 @@ CACHES = {
     }
 }
 
+# Count API key usage in Redis and flush it from Celery beat
+API_KEY_USAGE_BUFFERED = True
+
 # Celery with Redis in production
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND')